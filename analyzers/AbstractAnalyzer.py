@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 from articles.Article import Article
 
 
@@ -31,3 +32,19 @@ class AbstractAnalyzer(ABC):
             Article: The updated article after analysis.
         """
         pass
+
+    def analyze_batch(self, articles: List[Article]) -> List[Article]:
+        """
+        Analyze several articles at once.
+
+        The default implementation simply calls `analyze` on each article.
+        Analyzers that can submit their work in a single batched LLM call
+        should override it.
+
+        Args:
+            articles (List[Article]): The articles to be analyzed.
+
+        Returns:
+            List[Article]: The updated articles, in the same order.
+        """
+        return [self.analyze(article) for article in articles]
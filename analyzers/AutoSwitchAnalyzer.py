@@ -0,0 +1,50 @@
+from analyzers.AbstractAnalyzer import AbstractAnalyzer
+from analyzers.RelevanceAnalyzer import RelevanceAnalyzer
+from articles.Article import Article
+from typing import List
+
+
+class AutoSwitchAnalyzer(AbstractAnalyzer):
+    """
+    Analyzer that routes articles to a RelevanceAnalyzer, then to a distilled classifier.
+
+    The first `autoswitch_after` articles are labeled by the LLM-based `relevance`
+    analyzer; every later article goes to `distilled` (e.g. a DistilledRelevanceAnalyzer
+    trained on those labels). Both produce the same relevance labels
+    (POSITIVE / IRRELEVANT / UNCERTAIN), so the switch does not change what is predicted.
+    """
+
+    def __init__(self, relevance: RelevanceAnalyzer, distilled: AbstractAnalyzer, autoswitch_after: int = 5000,
+                 analyzed_count: int = 0):
+        """
+        Args:
+            relevance: The LLM relevance analyzer used first.
+            distilled: Cheaper relevance analyzer to switch to after `autoswitch_after` articles.
+            autoswitch_after: Number of articles labeled by `relevance` before switching.
+            analyzed_count: Articles already labeled in previous runs
+                (e.g. `len(loader.treated_items)`), counted towards `autoswitch_after`.
+        """
+        if not isinstance(relevance, RelevanceAnalyzer):
+            raise TypeError("AutoSwitchAnalyzer only switches away from a RelevanceAnalyzer")
+        self.relevance = relevance
+        self.distilled = distilled
+        self.autoswitch_after = autoswitch_after
+        self.analyzed_count = analyzed_count
+
+    def _use_distilled(self) -> bool:
+        return self.analyzed_count >= self.autoswitch_after
+
+    def analyze(self, article: Article) -> Article:
+        if self._use_distilled():
+            return self.distilled.analyze(article)
+        self.analyzed_count += 1
+        return self.relevance.analyze(article)
+
+    def analyze_batch(self, articles: List[Article]) -> List[Article]:
+        """
+        Send the whole batch to the analyzer in use when the batch starts.
+        """
+        if self._use_distilled():
+            return self.distilled.analyze_batch(articles)
+        self.analyzed_count += len(articles)
+        return self.relevance.analyze_batch(articles)
@@ -1,9 +1,20 @@
 from abc import abstractmethod
 from articles.Article import Article
 from utils import Label
+from typing import List, Tuple
 import re
 from .AbstractAnalyzer import AbstractAnalyzer
 from llm.LLMClient import LLMClient
+from llm.cache import cached_llm_call, cached_llm_generate, content_key, template_digest
+
+# Patterns used to parse the "Step 1..4" answer format, compiled once at import time
+_STEP_RE = re.compile(
+    r"Step\s*(?P<n>[1-4])[:\-–]\s*(?P<body>.*?)(?=\nStep\s*[1-4][:\-–]|\Z)",
+    re.IGNORECASE | re.DOTALL,
+)
+_SCORE_RE = re.compile(r"Score\s*=\s*([+-]?\d+)")
+_SCORE_LINE_RE = re.compile(r"Score\s*=\s*(.*)", re.IGNORECASE | re.DOTALL)
+_INT_RE = re.compile(r"[+-]?\d+")
 
 
 class BaseLLMAnalyzer(AbstractAnalyzer):
@@ -26,6 +37,7 @@ class BaseLLMAnalyzer(AbstractAnalyzer):
         """
         self.llm = llm
         self.max_chars = max_chars
+        self._template_digest = None
 
     def analyze(self, article: Article) -> Article:
         """
@@ -35,17 +47,59 @@ class BaseLLMAnalyzer(AbstractAnalyzer):
         Returns:
             The modified Article object with predictions and metadata.
         """
-        content = (article.content or "")[:self.max_chars].strip()
-        prompt = self.build_prompt(content)
+        prompt, key = self._request(article)
 
         try:
-            raw_output: str = self.llm(prompt, max_tokens=300, stop=["</s>"])
+            raw_output: str = cached_llm_call(self.llm, prompt, 300, ("</s>",), key=key)
         except Exception as e:
-            article.add_metadata("error", f"LLM call failed: {e}")
-            article.set_label(Label.ERROR)
-            article.mark_as_treated()
-            return article
+            return self._mark_error(article, e)
+
+        return self._apply_output(article, raw_output)
+
+    def analyze_batch(self, articles: List[Article]) -> List[Article]:
+        """
+        Analyze several articles with a single batched LLM call.
+
+        All prompts are built up front and the uncached ones are submitted together
+        through `LLMClient.generate`; outputs are then parsed back onto their articles.
+        An article whose prompt fails is labeled ERROR; the others keep their outputs.
+
+        Returns:
+            The modified Article objects, in the same order.
+        """
+        if not articles:
+            return []
+
+        prompts, keys = zip(*(self._request(article) for article in articles))
+
+        raw_outputs = cached_llm_generate(self.llm, list(prompts), 300, ("</s>",), keys=list(keys))
+
+        # A failed prompt only marks its own article as ERROR
+        return [
+            self._mark_error(article, raw_output) if isinstance(raw_output, Exception)
+            else self._apply_output(article, raw_output)
+            for article, raw_output in zip(articles, raw_outputs)
+        ]
+
+    def _request(self, article: Article) -> Tuple[str, str]:
+        """
+        Build the prompt of an article and its cache key.
 
+        The truncated content and its digest are cached on the article, and the
+        template digest on the analyzer, so the key never hashes the full prompt.
+        """
+        if self._template_digest is None:
+            # build_prompt is a pure function of the text: a placeholder identifies the template
+            self._template_digest = template_digest(self.build_prompt("\x00"))
+        content = article.get_truncated(self.max_chars)
+        key = content_key(self.llm, self._template_digest, article.get_truncated_digest(self.max_chars),
+                          300, ("</s>",))
+        return self.build_prompt(content), key
+
+    def _apply_output(self, article: Article, raw_output: str) -> Article:
+        """
+        Parse a raw LLM output and store the results in the article.
+        """
         parsed = self.parse_output(raw_output)
 
         for k, v in (parsed.get("analysis") or {}).items():
@@ -57,6 +111,16 @@ class BaseLLMAnalyzer(AbstractAnalyzer):
         article.mark_as_treated()
         return article
 
+    @staticmethod
+    def _mark_error(article: Article, error: Exception) -> Article:
+        """
+        Record a failed LLM call on the article.
+        """
+        article.add_metadata("error", f"LLM call failed: {error}")
+        article.set_label(Label.ERROR)
+        article.mark_as_treated()
+        return article
+
     @abstractmethod
     def build_prompt(self, article_text: str) -> str:
         """
@@ -70,23 +134,39 @@ class BaseLLMAnalyzer(AbstractAnalyzer):
         Returns a dictionary with keys: label, analysis, meta
         """
         try:
-            summary = self._extract_step(output, r"Step\s*1[:\-–]\s*(.*?)(?=\nStep\s*2[:\-–])")
-            step2 = self._extract_step(output, r"Step\s*2[:\-–]\s*(.*?)(?=\nStep\s*3[:\-–])")
-            politics = "yes" in step2.lower() if step2 else None
-            image = self._extract_step(output, r"Step\s*3[:\-–]\s*(.*?)(?=\nStep\s*4[:\-–])")
-            score_line = self._extract_step(output, r"Step\s*4[:\-–]\s*Score\s*=\s*(.*)")
-            scores = re.findall(r"Score\s*=\s*([+-]?\d+)", output)
-
-            ambiguous = len(set(scores)) > 1
+            # Lowercased copy for keyword detection, original text for what is stored
+            low = output.lower()
+            steps, low_steps = {}, {}
+            for m in _STEP_RE.finditer(output):
+                # Keep the first occurrence of each step, like a plain re.search would
+                steps.setdefault(m["n"], m["body"].strip())
+            for m in _STEP_RE.finditer(low):
+                low_steps.setdefault(m["n"], m["body"].strip())
+
+            summary = steps.get("1")
+            step2 = low_steps.get("2")
+            politics = "yes" in step2 if step2 else None
+            image = steps.get("3")
+            score_match = _SCORE_LINE_RE.match(steps.get("4") or "")
+            score_line = score_match.group(1).strip() if score_match else None
+
+            seen = set()
+            ambiguous = False
+            for m in _SCORE_RE.finditer(output):
+                seen.add(m.group(1))
+                if len(seen) > 1:
+                    ambiguous = True
+                    break
+
             error = None
             score = None
 
             if score_line:
-                if "unclear" in score_line.lower():
+                if "unclear" in (low_steps.get("4") or ""):
                     error = "unclear"
                 else:
                     try:
-                        score = int(re.search(r"[+-]?\d+", score_line).group(0))
+                        score = int(_INT_RE.search(score_line).group(0))
                     except:
                         error = "invalid_score"
 
@@ -116,13 +196,6 @@ class BaseLLMAnalyzer(AbstractAnalyzer):
                 }
             }
 
-    def _extract_step(self, text, pattern):
-        """
-        Utility to extract a specific step from the LLM output using regex.
-        """
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-        return match.group(1).strip() if match else None
-
     def infer_label(self, politics, score, ambiguous, error) -> Label:
         """
         Deduce the final label from parsed metadata.
@@ -1,7 +1,9 @@
 from analyzers.AbstractAnalyzer import AbstractAnalyzer
 from articles.Article import Article
-from utils import Label
-from typing import List
+from utils import Label, LABEL_TO_STR
+from typing import Callable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import copy
 
 
 class CompositeAnalyzer(AbstractAnalyzer):
@@ -16,48 +18,120 @@ class CompositeAnalyzer(AbstractAnalyzer):
     - If any analyzer returns UNCERTAIN → UNCERTAIN
     - If any analyzer returns ERROR → fallback to another non-error label
     - Otherwise, compute the average score and map it to a label
+
+    Child analyzers are independent, so they run concurrently in a thread pool,
+    each on its own deep copy of the article; their results are merged back
+    into the original article in analyzer order.
     """
 
-    def __init__(self, analyzers: List[AbstractAnalyzer]):
+    def __init__(self, analyzers: List[AbstractAnalyzer], max_workers: Optional[int] = None):
+        """
+        Args:
+            analyzers: The analyzers whose outputs are combined.
+            max_workers: Size of the thread pool (defaults to one thread per analyzer).
+        """
         self.analyzers = analyzers
+        # Content truncation limits of the children (None = whole content), shared through the article
+        self._max_chars = {getattr(analyzer, "max_chars", None) for analyzer in analyzers}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or max(len(analyzers), 1))
 
     def analyze(self, article: Article) -> Article:
+        self._share_truncations(article)
+
+        # Run all analyzers on their own copy of the article
+        results = self._run_all(lambda analyzer: analyzer.analyze(copy.deepcopy(article)))
+        return self._merge(article, results)
+
+    def analyze_batch(self, articles: List[Article]) -> List[Article]:
+        """
+        Run every child analyzer once over the whole batch, then aggregate per article.
+
+        N articles x M analyzers thus become M batched calls instead of N*M serial ones.
+        """
+        for article in articles:
+            self._share_truncations(article)
+
+        results = self._run_all(
+            lambda analyzer: analyzer.analyze_batch([copy.deepcopy(a) for a in articles])
+        )
+        return [
+            self._merge(article, [per_analyzer[i] for per_analyzer in results])
+            for i, article in enumerate(articles)
+        ]
+
+    def _share_truncations(self, article: Article) -> None:
+        """
+        Compute the truncated content (and its digest) once, before the article is copied
+        for each child: the copies carry the cached values instead of recomputing them.
+        """
+        for max_chars in self._max_chars:
+            article.get_truncated_digest(max_chars)
+
+    def _run_all(self, task: Callable[[AbstractAnalyzer], object]) -> list:
+        """
+        Submit `task` for every analyzer to the pool and return the results in analyzer order.
+        """
+        futures = {self._pool.submit(task, analyzer): i for i, analyzer in enumerate(self.analyzers)}
+        results = [None] * len(self.analyzers)
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+        return results
+
+    def _merge(self, article: Article, results: List[Article]) -> Article:
+        """
+        Copy the analysis/meta of each analyzer's result into the article, then aggregate.
+        """
+        for result in results:
+            article.analysis.update(result.analysis)
+            article.meta.update(result.meta)
+        return self._aggregate(article, [self._read_outcome(result) for result in results])
+
+    @staticmethod
+    def _read_outcome(result: Article) -> Tuple[Label, Optional[int], Optional[str]]:
+        """
+        Extract the (prediction, score, error) triple produced by one analyzer.
+        """
+        score_str = result.analysis.get("score")
+        try:
+            score = int(score_str) if score_str else None
+        except Exception:
+            score = None
+
+        return result.predicted_label, score, result.meta.get("error")
+
+    def _aggregate(self, article: Article, outcomes: List[Tuple[Label, Optional[int], Optional[str]]]) -> Article:
+        """
+        Combine the outcomes of all analyzers into the final label of the article.
+        """
         predictions = []
         scores = []
-        errors = []
+        bits = 0  # bitset of the predicted labels
+        score_sum = 0
+        score_count = 0
 
-        # Run all analyzers on the article
-        for analyzer in self.analyzers:
-            result = analyzer.analyze(article)
-            pred = result.predicted_label
+        for pred, score, _ in outcomes:
             predictions.append(pred)
-
-            score_str = result.analysis.get("score")
-            try:
-                score = int(score_str) if score_str else None
-            except Exception:
-                score = None
             scores.append(score)
-
-            error = result.meta.get("error")
-            errors.append(error)
+            bits |= pred.bit
+            if score is not None:
+                score_sum += score
+                score_count += 1
 
         # Save raw predictions and scores
-        article.meta["predictions"] = {f"model_{i}": p.value for i, p in enumerate(predictions)}
+        article.meta["predictions"] = {f"model_{i}": LABEL_TO_STR[p] for i, p in enumerate(predictions)}
         article.analysis["scores"] = {f"model_{i}": s for i, s in enumerate(scores)}
 
         # Aggregation rules
-        if Label.UNCERTAIN in predictions:
+        if bits & Label.UNCERTAIN.bit:
             final_label = Label.UNCERTAIN
-        elif Label.IRRELEVANT in predictions:
+        elif bits & Label.IRRELEVANT.bit:
             final_label = Label.IRRELEVANT
-        elif Label.ERROR in predictions:
-            non_error = [p for i, p in enumerate(predictions) if p != Label.ERROR]
+        elif bits & Label.ERROR.bit:
+            non_error = [p for p in predictions if p != Label.ERROR]
             final_label = non_error[0] if non_error else Label.ERROR
         else:
-            valid_scores = [s for s in scores if s is not None]
-            if valid_scores:
-                avg_score = sum(valid_scores) / len(valid_scores)
+            if score_count:
+                avg_score = score_sum / score_count
                 article.analysis["average_score"] = avg_score
 
                 if avg_score <= -1:
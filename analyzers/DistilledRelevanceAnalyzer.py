@@ -0,0 +1,89 @@
+from analyzers.AbstractAnalyzer import AbstractAnalyzer
+from articles.Article import Article
+from utils import Label
+from typing import Dict, List, Optional
+
+# Classifier labels mapped to the labels RelevanceAnalyzer assigns
+DEFAULT_LABEL_MAP = {
+    "relevant": Label.POSITIVE,
+    "irrelevant": Label.IRRELEVANT,
+    "uncertain": Label.UNCERTAIN,
+}
+
+
+class DistilledRelevanceAnalyzer(AbstractAnalyzer):
+    """
+    Relevance analyzer backed by a small fine-tuned text classifier (e.g. DistilBERT).
+
+    The classifier is meant to be distilled from `RelevanceAnalyzer`: fine-tuned on
+    the labels the LLM produced over a first set of articles, it then replaces a
+    300-token generation per article by a single batched forward pass.
+
+    Its labels ("relevant", "irrelevant", "uncertain" by default) are mapped to:
+    - POSITIVE → relevant to India
+    - IRRELEVANT → clearly not relevant
+    - UNCERTAIN → not enough information or ambiguous
+
+    Requires the optional `transformers` package (and `torch`).
+    """
+
+    def __init__(self, model_path: str, device: Optional[int] = None, batch_size: int = 128,
+                 max_chars: int = 2000, label_map: Optional[Dict[str, Label]] = None):
+        """
+        Args:
+            model_path: Path or Hugging Face id of the fine-tuned classifier.
+            device: Device index for the pipeline (-1 for CPU). Defaults to the first GPU if available.
+            batch_size: Number of articles classified per forward pass.
+            max_chars: Max number of characters sent to the classifier.
+            label_map: Mapping from classifier label (lowercased) to Label.
+        """
+        try:
+            from transformers import pipeline
+        except ImportError as e:
+            raise ImportError("DistilledRelevanceAnalyzer requires the 'transformers' package.") from e
+
+        if device is None:
+            try:
+                import torch
+                device = 0 if torch.cuda.is_available() else -1
+            except ImportError:
+                device = -1
+
+        self.classifier = pipeline("text-classification", model=model_path, device=device, batch_size=batch_size)
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self.label_map = label_map or DEFAULT_LABEL_MAP
+
+    def analyze(self, article: Article) -> Article:
+        return self.analyze_batch([article])[0]
+
+    def analyze_batch(self, articles: List[Article]) -> List[Article]:
+        """
+        Classify the articles in chunks of `batch_size`.
+        """
+        for start in range(0, len(articles), self.batch_size):
+            chunk = articles[start:start + self.batch_size]
+            texts = [article.get_truncated(self.max_chars) for article in chunk]
+
+            try:
+                predictions = self.classifier(texts, truncation=True)
+            except Exception as e:
+                for article in chunk:
+                    article.add_metadata("error", f"Classifier call failed: {e}")
+                    article.set_label(Label.ERROR)
+                    article.mark_as_treated()
+                continue
+
+            for article, prediction in zip(chunk, predictions):
+                article.add_analysis("relevance_answer", str(prediction["label"]))
+                article.add_analysis("relevance_confidence", f"{prediction['score']:.4f}")
+
+                label = self.label_map.get(str(prediction["label"]).lower())
+                if label is None:
+                    article.add_metadata("error", f"Unrecognized classifier label: {prediction['label']}")
+                    label = Label.ERROR
+
+                article.predicted_label = label
+                article.mark_as_treated()
+
+        return articles
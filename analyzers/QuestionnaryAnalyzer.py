@@ -1,6 +1,39 @@
+import hashlib
+import logging
+import pickle
+import re
+import orjson
 from .AbstractAnalyzer import AbstractAnalyzer
-from utils import Label
+from utils import Label, LABEL_TO_STR
 from articles.Article import Article
+from llm.cache import cached_llm_call, content_key, template_digest
+
+
+# Parses the "Q<number>: yes|no" lines returned for a compiled tree
+_ANSWER_RE = re.compile(r"Q(\d+)\s*:\s*(yes|no)\b", re.IGNORECASE)
+
+# Default generation budget of a question; the answer may come after an explanation
+FULL_MAX_TOKENS = 300
+FULL_STOP = ("</s>",)
+
+# A short (opt-in) budget is only trusted when the output starts with a whole-word yes/no
+_SHORT_ANSWER_RE = re.compile(r"\W*(yes|no)\b")
+
+# Bumped whenever the pickled node layout changes, to invalidate tree caches
+_TREE_CACHE_VERSION = b"4"
+
+# Placeholder used to pre-split prompt templates around their {article} field
+_ARTICLE_SLOT = "\x00article\x00"
+
+
+def _split_template(template: str) -> tuple:
+    """
+    Split a `str.format` template around its `{article}` fields.
+
+    Joining the parts with the article text gives the same result as
+    `template.format(article=text)`, escaped braces included, with a single concatenation.
+    """
+    return tuple(template.format(article=_ARTICLE_SLOT).split(_ARTICLE_SLOT))
 
 
 class QuestionnaryAnalyzer(AbstractAnalyzer):
@@ -11,82 +44,291 @@ class QuestionnaryAnalyzer(AbstractAnalyzer):
     then routes the article to a follow-up node depending on the answer.
     Leaf nodes assign a final label.
 
-    The full tree can be built from a structured JSON.
+    The full tree can be built from a structured JSON. Once built, the root can
+    be `compile()`d so that all questions are asked in a single LLM call; this
+    requires every node to carry a standalone `question` text.
+
+    Answers are decoded with the full budget by default. A smaller budget
+    (`max_tokens`, cut at `stop`) can be set for prompts that give yes/no first;
+    a short answer that does not start with yes or no is asked again with the full budget.
     """
 
-    def __init__(self, llm, prompt: str = None, question_name: str = '', if_no=None, if_yes=None, min_size: int = 0):
+    def __init__(self, llm, prompt: str = None, question_name: str = '', if_no=None, if_yes=None, min_size: int = 0,
+                 max_tokens: int = FULL_MAX_TOKENS, stop=FULL_STOP, question: str = None):
         super().__init__()
         self.prompt = prompt
         self.llm = llm
         self.question_name = question_name
+        self.question = question
         self.if_no = if_no
         self.if_yes = if_yes
         self.min_size = min_size
+        self.max_tokens = max_tokens
+        self.stop = tuple(stop)
+        self._prompt_parts = _split_template(prompt) if prompt is not None else None
+        self._template_digest = template_digest(*self._prompt_parts) if prompt is not None else None
+
+        # Set by compile(): question index of each internal node and the (prefix, suffix) of the combined prompt
+        self._question_index = None
+        self._compiled_prompt = None
 
     def analyze(self, article: Article) -> Article:
         """
         Analyze an article by asking a yes/no question and branching accordingly.
         """
-        content = (article.content or "").strip()
+        # Strip the article once; the whole subtree reuses the same string
+        return self._analyze_content(article, article.get_truncated())
+
+    def _analyze_content(self, article: Article, content: str) -> Article:
+        """
+        Analyze an article whose stripped content has already been computed.
+
+        The tree is walked with a loop rather than by recursing into each child.
+        """
+        node = self
+        while not isinstance(node, leaf):
+            node = node._step(article, content)
+            if node is None:
+                return article
+        return node.analyze(article)
+
+    def _step(self, article: Article, content: str):
+        """
+        Ask this node's question and return the node to visit next.
+
+        Returns:
+            The yes/no child, or None if the article was fully handled here
+            (TOO_SHORT, ERROR, or walked through the compiled tree).
+        """
         if len(content) < self.min_size:
             article.set_label(Label.TOO_SHORT)
             article.add_metadata("error", f"Content too short: {len(content)} characters")
             article.mark_as_treated()
-            return article
+            return None
 
-        prompt = self.prompt.format(article=content)
+        if self._compiled_prompt is not None:
+            self._analyze_compiled(article, content)
+            return None
 
-        try:
-            raw_output: str = self.llm(prompt, max_tokens=300, stop=["</s>"])
-        except Exception as e:
-            article.add_metadata("error", f"LLM call failed: {e}")
-            article.set_label(Label.ERROR)
-            article.mark_as_treated()
-            return article
+        answer = self._ask(article, content)
+        if answer is None:
+            return None
+        return self.if_yes if answer else self.if_no
+
+    def _ask(self, article: Article, content: str):
+        """
+        Ask this node's question about the article.
+
+        Returns:
+            True for yes, False for no, or None if the article was labeled ERROR.
+        """
+        prompt = content.join(self._prompt_parts)
+        content_digest = article.get_truncated_digest()
+
+        budgets = [(FULL_MAX_TOKENS, FULL_STOP)]
+        if (self.max_tokens, self.stop) != budgets[0]:
+            budgets.insert(0, (self.max_tokens, self.stop))
+
+        for max_tokens, stop in budgets:
+            key = content_key(self.llm, self._template_digest, content_digest, max_tokens, stop)
+            try:
+                raw_output: str = cached_llm_call(self.llm, prompt, max_tokens, stop, key=key)
+            except Exception as e:
+                article.add_metadata("error", f"LLM call failed: {e}")
+                article.set_label(Label.ERROR)
+                article.mark_as_treated()
+                return None
+
+            low = raw_output.lower()
+            if max_tokens == FULL_MAX_TOKENS and stop == FULL_STOP:
+                break
+            short_answer = _SHORT_ANSWER_RE.match(low)
+            if short_answer:
+                article.add_analysis(self.question_name, raw_output)
+                return short_answer.group(1) == "yes"
 
         article.add_analysis(self.question_name, raw_output)
 
-        if "yes" in raw_output.lower():
-            return self.if_yes.analyze(article)
-        elif "no" in raw_output.lower():
-            return self.if_no.analyze(article)
+        if "yes" in low:
+            return True
+        elif "no" in low:
+            return False
         else:
             article.add_metadata("error", f"Invalid response from question '{self.question_name}': {raw_output}")
             article.set_label(Label.ERROR)
             article.mark_as_treated()
+            return None
+
+    def compile(self) -> "QuestionnaryAnalyzer":
+        """
+        Flatten the tree below this node into one multi-question prompt.
+
+        The tree is static, so every question can be asked in a single LLM call
+        that answers them all; the tree is then walked locally using these answers.
+        Nodes whose answer cannot be parsed are asked individually.
+
+        Each question is listed by its `question` text (`question_name` is only an
+        identifier, and `prompt` embeds its own answer format).
+
+        Returns:
+            self, to allow `QuestionnaryAnalyzer.build_tree_from_json(...).compile()`.
+
+        Raises:
+            ValueError: if a node below this one has no `question` text.
+        """
+        questions = []
+        seen = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, leaf) or id(node) in seen:
+                continue
+            seen.add(id(node))
+            questions.append(node)
+            stack.extend((node.if_no, node.if_yes))
+
+        missing = [node.question_name for node in questions if not node.question]
+        if missing:
+            raise ValueError(f"Cannot compile the tree: no 'question' text for node(s) {', '.join(missing)}")
+
+        self._question_index = {id(node): i for i, node in enumerate(questions, start=1)}
+        question_lines = "\n".join(f"Q{i}: {node.question}" for i, node in enumerate(questions, start=1))
+        self._compiled_prompt = (
+            "[INST] Read the following article, then answer each question below with yes or no.\n"
+            "Answer every question on its own line, formatted as 'Q<number>: yes' or 'Q<number>: no'.\n\n"
+            "Article:\n",
+            f"\n\nQuestions:\n{question_lines}\n\nYour answers: [/INST]",
+        )
+        return self
+
+    def _analyze_compiled(self, article: Article, content: str) -> Article:
+        """
+        Answer all questions with one LLM call, then walk the tree locally.
+        """
+        prompt = content.join(self._compiled_prompt)
+        max_tokens = max(300, 8 * len(self._question_index))
+
+        try:
+            raw_output: str = cached_llm_call(self.llm, prompt, max_tokens, ("</s>",))
+        except Exception as e:
+            article.add_metadata("error", f"LLM call failed: {e}")
+            article.set_label(Label.ERROR)
+            article.mark_as_treated()
             return article
 
+        article.add_analysis("compiled_answers", raw_output)
+
+        answers = {}
+        for number, answer in _ANSWER_RE.findall(raw_output):
+            answers.setdefault(int(number), answer.lower() == "yes")
+
+        node = self
+        while not isinstance(node, leaf):
+            answer = answers.get(self._question_index[id(node)])
+            if answer is None:
+                # Fall back to asking this node on its own
+                answer = node._ask(article, content)
+                if answer is None:
+                    return article
+            else:
+                article.add_analysis(node.question_name, "yes" if answer else "no")
+            node = node.if_yes if answer else node.if_no
+
+        return node.analyze(article)
+
     @staticmethod
     def build_tree_from_json(data: dict, llm) -> AbstractAnalyzer:
         """
-        Recursively constructs the tree from a JSON structure.
+        Constructs the tree from a JSON structure.
         """
         node_objects = {}
         min_size = data.get("min_size", 0)
+        max_tokens = data.get("max_tokens", FULL_MAX_TOKENS)
+        stop = data.get("stop", FULL_STOP)
 
         # Create all leaf nodes
         for leaf_id, label_str in data["leaves"].items():
             node_objects[leaf_id] = leaf(Label[label_str])
 
-        # Create internal nodes without linking branches yet
+        # Create internal nodes, remembering their branches to link them once all nodes exist
+        links = []
         for node_id, node_data in data["nodes"].items():
-            node_objects[node_id] = QuestionnaryAnalyzer(
+            node = QuestionnaryAnalyzer(
                 llm=llm,
                 prompt=node_data["prompt"],
                 question_name=node_data["question_name"],
-                if_yes=None,  # Will be set in next loop
-                if_no=None,
-                min_size=min_size
+                question=node_data.get("question"),
+                min_size=min_size,
+                max_tokens=max_tokens,
+                stop=stop,
             )
+            node_objects[node_id] = node
+            links.append((node, node_data["if_yes"], node_data["if_no"]))
 
-        # Link child branches
-        for node_id, node_data in data["nodes"].items():
-            node = node_objects[node_id]
-            node.if_yes = node_objects[node_data["if_yes"]]
-            node.if_no = node_objects[node_data["if_no"]]
+        for node, if_yes, if_no in links:
+            node.if_yes = node_objects[if_yes]
+            node.if_no = node_objects[if_no]
 
         return node_objects[data["root"]]
 
+    @staticmethod
+    def load_tree(path: str, llm, cache_path: str = ".qtree.cache") -> AbstractAnalyzer:
+        """
+        Load a tree JSON file, reusing the pickled tree cached at `cache_path`.
+
+        The cache is keyed on the SHA-256 of the JSON file (and of the node layout
+        version), so editing the tree invalidates it. The LLM is not pickled and is attached after loading.
+        If `cache_path` is None, the tree is always rebuilt from JSON.
+        """
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(_TREE_CACHE_VERSION + b"\0" + raw).hexdigest()
+
+        if cache_path:
+            try:
+                with open(cache_path, "rb") as f:
+                    cached_digest, root = pickle.load(f)
+                if cached_digest == digest:
+                    root._attach_llm(llm)
+                    return root
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning("Ignoring unreadable tree cache %s: %s", cache_path, e)
+
+        root = QuestionnaryAnalyzer.build_tree_from_json(orjson.loads(raw), llm)
+
+        if cache_path:
+            try:
+                with open(cache_path, "wb") as f:
+                    pickle.dump((digest, root), f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                logging.warning("Could not write tree cache %s: %s", cache_path, e)
+
+        return root
+
+    def _attach_llm(self, llm) -> None:
+        """
+        Set the LLM of every internal node below this one.
+        """
+        seen = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, leaf) or id(node) in seen:
+                continue
+            seen.add(id(node))
+            node.llm = llm
+            stack.extend((node.if_no, node.if_yes))
+
+    def __getstate__(self):
+        # The LLM client holds the loaded model, and compile() indexes nodes by id(): neither survives pickling
+        state = self.__dict__.copy()
+        state.pop("llm", None)
+        state["_question_index"] = None
+        state["_compiled_prompt"] = None
+        return state
+
     def __str__(self):
         return self.r__str__(0)
 
@@ -111,9 +353,8 @@ class leaf(QuestionnaryAnalyzer):
 
     def analyze(self, article: Article) -> Article:
         article.set_label(self.answer)
-        article.add_metadata("small_content", article.content[:200] if article.content else "")
         article.mark_as_treated()
-        article.add_analysis("leaf_answer", str(self.answer.value))
+        article.add_analysis("leaf_answer", LABEL_TO_STR[self.answer])
         return article
 
     def r__str__(self, level=0):
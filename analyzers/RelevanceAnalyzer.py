@@ -1,6 +1,8 @@
 from analyzers.AbstractAnalyzer import AbstractAnalyzer
 from articles.Article import Article
 from utils import Label
+from llm.cache import cached_llm_call, cached_llm_generate, content_key, template_digest
+from typing import List, Tuple
 
 
 class RelevanceAnalyzer(AbstractAnalyzer):
@@ -17,49 +19,86 @@ class RelevanceAnalyzer(AbstractAnalyzer):
     - UNCERTAIN → not enough information or ambiguous
     """
 
+    # Constant parts of the prompt, built once at import time
+    _PREFIX = (
+        "[INST] You are a relevance classification assistant. Your task is to decide if an article affects "
+        "the reader's perception of India — politically, socially, or symbolically.\n\n"
+        "An article is RELEVANT if any of the following applies:\n"
+        "1. India is one of the main subjects of the article.\n"
+        "2. The article focuses on Indian political/institutional figures in a meaningful way.\n"
+        "3. India is directly involved (host, participant, target, etc.).\n"
+        "4. It discusses Indian foreign/domestic policy or international image.\n"
+        "5. It reflects on how India or its institutions are perceived.\n\n"
+        "An article is IRRELEVANT if:\n"
+        "1. India is briefly mentioned or appears in a list.\n"
+        "2. 'India' refers to something else (e.g., hemp, Native Americans).\n"
+        "3. The topic is unrelated sports, celebrity gossip, or market data.\n"
+        "4. It covers another country's affairs without mentioning India.\n\n"
+        "Instructions:\n"
+        "Step 1: Summarize the article in 2–3 sentences.\n"
+        "Step 2: Is India a main subject? Explain.\n"
+        "Step 3: Any exclusion criteria matched? Justify.\n"
+        "Step 4: relevancy: [yes/no/missing information] [END]\n\n"
+        "Now analyze the following article:\n"
+        "Article:\n"
+    )
+    _SUFFIX = "\n\nYour response:\n[/INST]"
+    _TEMPLATE_DIGEST = template_digest(_PREFIX, _SUFFIX)
+
     def __init__(self, llm, max_chars: int = 2000):
         self.llm = llm
         self.max_chars = max_chars
 
     def analyze(self, article: Article) -> Article:
-        content = (article.content or "")[:self.max_chars].strip()
-
-        prompt = (
-            "[INST] You are a relevance classification assistant. Your task is to decide if an article affects "
-            "the reader's perception of India — politically, socially, or symbolically.\n\n"
-            "An article is RELEVANT if any of the following applies:\n"
-            "1. India is one of the main subjects of the article.\n"
-            "2. The article focuses on Indian political/institutional figures in a meaningful way.\n"
-            "3. India is directly involved (host, participant, target, etc.).\n"
-            "4. It discusses Indian foreign/domestic policy or international image.\n"
-            "5. It reflects on how India or its institutions are perceived.\n\n"
-            "An article is IRRELEVANT if:\n"
-            "1. India is briefly mentioned or appears in a list.\n"
-            "2. 'India' refers to something else (e.g., hemp, Native Americans).\n"
-            "3. The topic is unrelated sports, celebrity gossip, or market data.\n"
-            "4. It covers another country's affairs without mentioning India.\n\n"
-            "Instructions:\n"
-            "Step 1: Summarize the article in 2–3 sentences.\n"
-            "Step 2: Is India a main subject? Explain.\n"
-            "Step 3: Any exclusion criteria matched? Justify.\n"
-            "Step 4: relevancy: [yes/no/missing information] [END]\n\n"
-            "Now analyze the following article:\n"
-            f"Article:\n{content}\n\n"
-            "Your response:\n[/INST]"
-        )
+        prompt, key = self._request(article)
 
         try:
-            output: str = self.llm(prompt, max_tokens=300, stop=["</s>"])
+            output: str = cached_llm_call(self.llm, prompt, 300, ("</s>",), key=key)
         except Exception as e:
-            article.add_metadata("error", f"LLM call failed: {e}")
-            article.set_label(Label.ERROR)
-            article.mark_as_treated()
-            return article
+            return self._mark_error(article, e)
+
+        return self._apply_output(article, output)
+
+    def analyze_batch(self, articles: List[Article]) -> List[Article]:
+        """
+        Analyze several articles with a single batched LLM call.
+        """
+        if not articles:
+            return []
+
+        prompts, keys = zip(*(self._request(article) for article in articles))
+
+        outputs = cached_llm_generate(self.llm, list(prompts), 300, ("</s>",), keys=list(keys))
+
+        # A failed prompt only marks its own article as ERROR
+        return [
+            self._mark_error(article, output) if isinstance(output, Exception) else self._apply_output(article, output)
+            for article, output in zip(articles, outputs)
+        ]
 
-        article.analysis = article.analysis or {}
+    def build_prompt(self, article_text: str) -> str:
+        """
+        Constructs the relevance prompt sent to the LLM.
+        """
+        return "".join((self._PREFIX, article_text, self._SUFFIX))
+
+    def _request(self, article: Article) -> Tuple[str, str]:
+        """
+        Build the prompt of an article and its cache key, from the truncated content cached on the article.
+        """
+        key = content_key(self.llm, self._TEMPLATE_DIGEST, article.get_truncated_digest(self.max_chars),
+                          300, ("</s>",))
+        return self.build_prompt(article.get_truncated(self.max_chars)), key
+
+    def _apply_output(self, article: Article, output: str) -> Article:
+        """
+        Map the last line of the LLM output to a relevance label.
+        """
         article.analysis["relevance_answer"] = output
 
-        last_line = output.splitlines()[-1].strip()
+        # Only the last line matters: scan back to it instead of splitting every line
+        tail = output.rstrip()
+        last_line = tail[tail.rfind("\n") + 1:].strip().lower()
 
         if "yes" in last_line:
             article.predicted_label = Label.POSITIVE
@@ -73,3 +112,13 @@ class RelevanceAnalyzer(AbstractAnalyzer):
 
         article.mark_as_treated()
         return article
+
+    @staticmethod
+    def _mark_error(article: Article, error: Exception) -> Article:
+        """
+        Record a failed LLM call on the article.
+        """
+        article.add_metadata("error", f"LLM call failed: {error}")
+        article.set_label(Label.ERROR)
+        article.mark_as_treated()
+        return article
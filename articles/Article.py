@@ -1,25 +1,46 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict
-from utils import Label
-
-
-class Article(BaseModel):
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Iterator, Tuple
+import hashlib
+import logging
+import mmap
+import os
+import orjson
+from utils import Label, LABEL_TO_STR
+
+
+@dataclass(slots=True)
+class Article:
     """
     Represents a text article to be analyzed and labeled.
 
     This structure holds both the raw content and the processing metadata,
     including true and predicted labels, analysis traces, and free-form metadata.
+
+    It is a plain slotted dataclass: no validation happens on construction,
+    so labels must already be `Label` members (see `from_dict` for raw data).
     """
 
     id: str
-    content: Optional[str] = ""
+    content: str = ""
     treated: bool = False
     true_label: Optional[Label] = None
     predicted_label: Optional[Label] = None
 
-    # Optional dictionaries for analysis steps and debug/info metadata
-    analysis: Optional[Dict[str, str]] = None
-    meta: Optional[Dict[str, str]] = None
+    # Dictionaries for analysis steps and debug/info metadata
+    analysis: Dict[str, str] = field(default_factory=dict)
+    meta: Dict[str, str] = field(default_factory=dict)
+
+    # SHA-256 of the content, persisted so duplicates are found even once the content is dropped
+    content_sha256: Optional[str] = None
+
+    # Transient cache of get_truncated(): max_chars -> (source content, truncated text, SHA-256 digest)
+    _truncated: Dict[Optional[int], Tuple[str, str, Optional[str]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.content_sha256 is None and self.content:
+            self.content_sha256 = hashlib.sha256(self.content.encode("utf-8")).hexdigest()
 
     def mark_as_treated(self):
         """
@@ -27,6 +48,15 @@ class Article(BaseModel):
         """
         self.treated = True
 
+    def drop_content(self):
+        """
+        Release the content (and its truncations) once it is no longer needed.
+
+        `content_sha256` is kept, so the article still identifies duplicates.
+        """
+        self.content = ""
+        self._truncated.clear()
+
     def set_label(self, label: Label):
         """
         Set the predicted label for this article.
@@ -37,18 +67,49 @@ class Article(BaseModel):
         """
         Add or update an analysis output (e.g., result of a step).
         """
-        if self.analysis is None:
-            self.analysis = {}
         self.analysis[method] = result
 
     def add_metadata(self, key: str, value: str):
         """
         Add or update metadata (e.g., model used, error messages, etc.).
         """
-        if self.meta is None:
-            self.meta = {}
         self.meta[key] = value
 
+    def get_truncated(self, max_chars: Optional[int] = None) -> str:
+        """
+        Return the content cut to `max_chars` characters and stripped.
+
+        The result is computed once per `max_chars` value, so analyzers sharing
+        the same limit (e.g. inside a CompositeAnalyzer) reuse it.
+        """
+        return self._truncated_entry(max_chars)[1]
+
+    def get_truncated_digest(self, max_chars: Optional[int] = None) -> str:
+        """
+        Return the SHA-256 hex digest of `get_truncated(max_chars)`, computed once.
+        """
+        source, text, digest = self._truncated_entry(max_chars)
+        if digest is None:
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            self._truncated[max_chars] = (source, text, digest)
+        return digest
+
+    def _truncated_entry(self, max_chars: Optional[int]) -> Tuple[str, str, Optional[str]]:
+        content = self.content or ""
+        entry = self._truncated.get(max_chars)
+        # Entries are only valid for the content they were computed from
+        if entry is None or entry[0] is not content:
+            entry = (content, content[:max_chars].strip(), None)
+            self._truncated[max_chars] = entry
+        return entry
+
+    @property
+    def preview(self) -> str:
+        """
+        Return the first 200 characters of the content, computed on demand.
+        """
+        return self.content[:200] if self.content else ""
+
     def short_str(self, max_chars: int = 50) -> str:
         """
         Return a short string preview of the article.
@@ -59,22 +120,22 @@ class Article(BaseModel):
     def to_dict(self, include_content: bool = True) -> dict:
         """
         Export the article as a serializable dictionary, with optional content field.
+        Without content, a short `preview` of it is included instead.
         Converts enum labels and nested fields to strings.
         """
-        data = self.model_dump()
+        data = asdict(self)
+        data.pop("_truncated", None)
 
         if not include_content:
             data.pop("content", None)
+            data["preview"] = self.preview
 
         # Serialize labels and fields
-        data["true_label"] = str(self.true_label.value) if self.true_label else None
-        data["predicted_label"] = str(self.predicted_label.value) if self.predicted_label else None
+        data["true_label"] = LABEL_TO_STR[self.true_label] if self.true_label else None
+        data["predicted_label"] = LABEL_TO_STR[self.predicted_label] if self.predicted_label else None
 
-        if self.analysis is not None:
-            data["analysis"] = {k: str(v) for k, v in self.analysis.items()}
-
-        if self.meta is not None:
-            data["meta"] = {k: str(v) for k, v in self.meta.items()}
+        data["analysis"] = {k: str(v) for k, v in self.analysis.items()}
+        data["meta"] = {k: str(v) for k, v in self.meta.items()}
 
         return data
 
@@ -82,14 +143,89 @@ class Article(BaseModel):
     def from_dict(cls, data: dict, keep_content: bool = True) -> "Article":
         """
         Restore an Article object from a dictionary.
+
+        Label values are converted back to `Label` members and missing
+        dictionaries default to empty ones.
         """
         if not keep_content:
             data.pop("content", None)
 
-        return cls(**data)
+        true_label = data.get("true_label")
+        predicted_label = data.get("predicted_label")
+
+        return cls(
+            id=data["id"],
+            content=data.get("content") or "",
+            treated=bool(data.get("treated", False)),
+            true_label=Label(true_label) if true_label else None,
+            predicted_label=Label(predicted_label) if predicted_label else None,
+            analysis=data.get("analysis") or {},
+            meta=data.get("meta") or {},
+            content_sha256=data.get("content_sha256"),
+        )
 
     def get_id(self) -> str:
         """
         Return the article's ID.
         """
         return self.id
+
+
+def is_json_list(path: str) -> bool:
+    """
+    Return True if `path` holds a JSON list (the legacy treated-file format) rather than JSON Lines.
+    """
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(4096)
+            if not chunk:
+                return False
+            chunk = chunk.lstrip()
+            if chunk:
+                return chunk[:1] == b"["
+
+
+def load_articles(path: str, keep_content: bool = True) -> Iterator[Article]:
+    """
+    Yield the articles stored in a JSON Lines file (one serialized article per line).
+
+    Files holding a single JSON list of articles (the legacy format) are read too.
+    The file is memory-mapped and parsed by orjson straight from the mapping,
+    so pages are read on demand and never copied into an intermediate str.
+
+    A JSON Lines file may end with a partially written line if a run was
+    interrupted; invalid lines (or lines that are not JSON objects) are skipped with a warning.
+
+    Args:
+        path: The JSONL (or JSON list) file of serialized articles.
+        keep_content: Whether to keep the `content` field of each article.
+
+    Raises:
+        json.JSONDecodeError: If a JSON list file is not valid JSON (orjson's error subclasses it).
+    """
+    if os.path.getsize(path) == 0:
+        return
+
+    if is_json_list(path):
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                data = orjson.loads(view)
+        for article_data in data:
+            yield Article.from_dict(article_data, keep_content=keep_content)
+    else:
+        # One line at a time: only the current article is held as a dict
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line_number, line in enumerate(iter(mm.readline, b""), start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        item = orjson.loads(line)
+                    except orjson.JSONDecodeError as e:
+                        logging.warning("Skipping invalid line %d of '%s': %s", line_number, path, e)
+                        continue
+                    if not isinstance(item, dict):
+                        logging.warning("Skipping line %d of '%s': expected an object, got %s",
+                                        line_number, path, type(item))
+                        continue
+                    yield Article.from_dict(item, keep_content=keep_content)
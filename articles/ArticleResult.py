@@ -0,0 +1,32 @@
+from typing import Dict, NamedTuple, Optional
+from articles.Article import Article
+from utils import Label
+
+# Characters of content kept in `ArticleResult.excerpt` (shown in error exports)
+EXCERPT_CHARS = 800
+
+
+class ArticleResult(NamedTuple):
+    """
+    Compact outcome of the analysis of an article, without its full content.
+
+    This is what `ArticleProcessor` keeps for evaluation, so the content of
+    processed articles can be freed during a run. It has the label attributes
+    of an `Article`, so `ArticleStore` and `ArticleEvaluator` accept either.
+    Only the first `EXCERPT_CHARS` characters are kept, for error exports.
+    """
+
+    id: str
+    true_label: Optional[Label]
+    predicted_label: Optional[Label]
+    analysis: Dict[str, str]
+    meta: Dict[str, str]
+    excerpt: str = ""
+
+    @classmethod
+    def from_article(cls, article: Article) -> "ArticleResult":
+        """
+        Build the result of an article; must be called before `Article.drop_content`.
+        """
+        return cls(article.id, article.true_label, article.predicted_label, article.analysis, article.meta,
+                   article.content[:EXCERPT_CHARS])
@@ -0,0 +1,55 @@
+from typing import List, Union
+import numpy as np
+from articles.Article import Article
+from articles.ArticleResult import ArticleResult
+from utils import Label, LABEL_CODES, LABEL_TO_STR
+
+# Code stored when an article has no label
+MISSING = -1
+
+# Label string values indexed by label code
+_VALUES = np.array([LABEL_TO_STR[label] for label in Label], dtype=object)
+
+
+class ArticleStore:
+    """
+    Column-oriented (struct-of-arrays) view of a list of articles.
+
+    Labels are stored once as int8 codes (see `utils.LABEL_CODES`, `MISSING` when
+    absent) in parallel NumPy arrays, so bulk evaluation runs as vector operations
+    instead of a Python loop over Article objects (see `evaluators.kernels`).
+    The articles themselves are kept for single-item access; `ArticleResult`
+    items are accepted as well.
+    """
+
+    def __init__(self, articles: List[Union[Article, ArticleResult]]):
+        """
+        Args:
+            articles (List[Union[Article, ArticleResult]]): Articles to index.
+        """
+        n = len(articles)
+        self.articles = articles
+        self.true = np.full(n, MISSING, dtype=np.int8)
+        self.pred = np.full(n, MISSING, dtype=np.int8)
+
+        for i, a in enumerate(articles):
+            if a.true_label is not None:
+                self.true[i] = LABEL_CODES[a.true_label]
+            if a.predicted_label is not None:
+                self.pred[i] = LABEL_CODES[a.predicted_label]
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def labelled_mask(self) -> np.ndarray:
+        """
+        Return a boolean mask of the articles having both a true and a predicted label.
+        """
+        return (self.true >= 0) & (self.pred >= 0)
+
+    @staticmethod
+    def decode(codes: np.ndarray) -> np.ndarray:
+        """
+        Map label codes back to their string values.
+        """
+        return _VALUES[codes]
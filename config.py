@@ -7,6 +7,10 @@ load_dotenv()
 DATA_DIR = os.getenv("DATA_DIR", "../data")
 TREATED_FILE = os.getenv("TREATED_FILE", "treated_items.json")
 MODEL_PATH = os.getenv("MODEL_PATH")
+MODEL_QUANT = os.getenv("MODEL_QUANT", "q4_k_m")
 QUESTION_TREE_PATH = os.getenv("QUESTION_TREE_PATH")
+QUESTION_TREE_CACHE_PATH = os.getenv("QUESTION_TREE_CACHE_PATH", ".qtree.cache")
 MAX_CHARS = int(os.getenv("MAX_CHARS", 2000))
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
\ No newline at end of file
+MIN_CHARS = int(os.getenv("MIN_CHARS", 200))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR")
\ No newline at end of file
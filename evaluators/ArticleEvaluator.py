@@ -1,9 +1,13 @@
-from typing import List, Tuple
+from typing import List, Tuple, Union
+import numpy as np
 from articles.Article import Article
-from utils import Label
+from articles.ArticleResult import ArticleResult, EXCERPT_CHARS
+from articles.ArticleStore import ArticleStore
+from evaluators.kernels import extract_pairs, to_binary, BINARY_NAMES
+from utils import LABEL_TO_STR
 from sklearn.metrics import classification_report, confusion_matrix
 import os
-import json
+import orjson
 
 
 class ArticleEvaluator:
@@ -15,33 +19,33 @@ class ArticleEvaluator:
     - Binary relevance collapsed into {relevant, irrelevant}
 
     It also supports exporting misclassified items for manual analysis.
+
+    Labels are read once into an `ArticleStore`, so metrics are computed by
+    the array kernels of `evaluators.kernels` (Numba-compiled when available).
     """
 
-    def __init__(self, articles: List[Article]):
+    def __init__(self, articles: List[Union[Article, ArticleResult]]):
         """
         Initialize the evaluator with a list of processed articles.
 
         Args:
-            articles (List[Article]): Articles that contain both true and predicted labels.
+            articles (List[Union[Article, ArticleResult]]): Articles (or their compact
+                results, as collected by `ArticleProcessor`) with true and predicted labels.
         """
         self.articles = articles
+        self.store = ArticleStore(articles)
 
     # ---------- helpers ----------
 
-    def _extract_gold_and_pred(self) -> Tuple[List[str], List[str]]:
+    def _extract_gold_and_pred(self) -> Tuple[np.ndarray, np.ndarray]:
         """
         Extract ground-truth and predicted labels as strings, skipping items with missing labels.
 
         Returns:
-            Tuple[List[str], List[str]]: (y_true, y_pred) lists with aligned items.
+            Tuple[np.ndarray, np.ndarray]: (y_true, y_pred) arrays with aligned items.
         """
-        y_true, y_pred = [], []
-        for a in self.articles:
-            if a.true_label is None or a.predicted_label is None:
-                continue
-            y_true.append(str(a.true_label.value))
-            y_pred.append(str(a.predicted_label.value))
-        return y_true, y_pred
+        y_true, y_pred = extract_pairs(self.store.true, self.store.pred)
+        return ArticleStore.decode(y_true), ArticleStore.decode(y_pred)
 
     # ---------- multiclass ----------
 
@@ -52,7 +56,7 @@ class ArticleEvaluator:
         This uses all available labeled items where both true and predicted labels exist.
         """
         y_true, y_pred = self._extract_gold_and_pred()
-        if not y_true:
+        if len(y_true) == 0:
             print("[WARN] No items with both true and predicted labels. Skipping multiclass evaluation.")
             return
 
@@ -64,52 +68,26 @@ class ArticleEvaluator:
 
     # ---------- binary relevance ----------
 
-    @staticmethod
-    def _to_binary_rel(label_str: str) -> str:
-        """
-        Map a Label string to binary relevance.
-
-        Args:
-            label_str (str): Label value (e.g., 'positive', 'irrelevant').
-
-        Returns:
-            str: 'relevant' | 'irrelevant' | 'skip'
-        """
-        if label_str in {
-            str(Label.POSITIVE.value),
-            str(Label.NEGATIVE.value),
-            str(Label.NEUTRAL.value),
-        }:
-            return "relevant"
-        if label_str == str(Label.IRRELEVANT.value):
-            return "irrelevant"
-        return "skip"  # UNCERTAIN, ERROR, TOO_SHORT, NEED_HUMAN_REVIEW, UNGRADED
-
-    def _extract_binary_rel(self) -> Tuple[List[str], List[str]]:
+    def _extract_binary_rel(self) -> Tuple[np.ndarray, np.ndarray]:
         """
         Extract binary relevance gold/pred vectors, skipping items we cannot score.
 
+        POSITIVE, NEGATIVE and NEUTRAL count as relevant, IRRELEVANT as irrelevant;
+        any other label (UNCERTAIN, ERROR, TOO_SHORT, ...) is skipped.
+
         Returns:
-            Tuple[List[str], List[str]]: (y_true, y_pred) with values in {'relevant','irrelevant'}.
+            Tuple[np.ndarray, np.ndarray]: (y_true, y_pred) with values in {'relevant','irrelevant'}.
         """
-        y_true_bin, y_pred_bin = [], []
-        for a in self.articles:
-            if a.true_label is None or a.predicted_label is None:
-                continue
-            t = self._to_binary_rel(str(a.true_label.value))
-            p = self._to_binary_rel(str(a.predicted_label.value))
-            if t == "skip" or p == "skip":
-                continue
-            y_true_bin.append(t)
-            y_pred_bin.append(p)
-        return y_true_bin, y_pred_bin
+        # Skipped items map to -1, which extract_pairs drops
+        t, p = extract_pairs(to_binary(self.store.true), to_binary(self.store.pred))
+        return BINARY_NAMES[t], BINARY_NAMES[p]
 
     def evaluate_binary_relevance(self) -> None:
         """
         Print a classification report and confusion matrix for binary relevance.
         """
         y_true, y_pred = self._extract_binary_rel()
-        if not y_true:
+        if len(y_true) == 0:
             print("[WARN] No items suitable for binary relevance evaluation.")
             return
 
@@ -127,34 +105,44 @@ class ArticleEvaluator:
 
         The exported JSON includes a compact view of each article:
         id, content excerpt, true_label, predicted_label, and useful analysis/meta fields.
+        The excerpt of an `ArticleResult` is the one it kept before its article's content was dropped.
 
         Args:
             output_dir (str): Directory where error JSON files will be written.
         """
         os.makedirs(output_dir, exist_ok=True)
 
-        errors_by_pred = {}  # predicted_label -> list[dict]
-        for a in self.articles:
-            if a.true_label is None or a.predicted_label is None:
-                continue
-            t = str(a.true_label.value)
-            p = str(a.predicted_label.value)
-            if t == p:
-                continue  # correct prediction, skip
-
-            item = {
-                "id": a.id,
-                "true_label": t,
-                "predicted_label": p,
-                "content": (a.content[:800] + "...") if a.content else "",
-                "analysis": a.analysis or {},
-                "meta": a.meta or {},
-            }
-            errors_by_pred.setdefault(p, []).append(item)
-
-        # Write one file per predicted label
-        for pred_label, items in errors_by_pred.items():
-            out_path = os.path.join(output_dir, f"errors_pred_{pred_label}.json")
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(items, f, ensure_ascii=False, indent=2)
+        # Misclassified items only (correct predictions are skipped)
+        errors = np.flatnonzero(self.store.labelled_mask() & (self.store.true != self.store.pred))
+
+        # One file per predicted label, opened on its first error; items are written as they are found
+        files = {}  # predicted_label -> open binary file
+        try:
+            for i in errors:
+                a = self.articles[i]
+                t = LABEL_TO_STR[a.true_label]
+                p = LABEL_TO_STR[a.predicted_label]
+                content = a.excerpt if isinstance(a, ArticleResult) else a.content[:EXCERPT_CHARS]
+
+                item = {
+                    "id": a.id,
+                    "true_label": t,
+                    "predicted_label": p,
+                    "content": (content + "...") if content else "",
+                    "analysis": a.analysis or {},
+                    "meta": a.meta or {},
+                }
+
+                f = files.get(p)
+                if f is None:
+                    f = files[p] = open(os.path.join(output_dir, f"errors_pred_{p}.json"), "wb")
+                    f.write(b"[\n")
+                else:
+                    f.write(b",\n")
+                f.write(orjson.dumps(item, option=orjson.OPT_INDENT_2))
+        finally:
+            for f in files.values():
+                f.write(b"\n]\n")
+                f.close()
+
         print(f"[INFO] Exported error datasets to '{output_dir}/'.")
@@ -0,0 +1,74 @@
+"""
+Compiled kernels for bulk label evaluation.
+
+They work on the int8 label-code arrays of an `ArticleStore` (-1 = missing).
+Numba is an optional dependency: when it is installed the loops are JIT-compiled
+(and cached on disk, so the compilation cost is paid once); otherwise equivalent
+vectorized NumPy implementations are used.
+"""
+
+import numpy as np
+from utils import LABEL_CODES, BIN_MAP
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is not installed, use the NumPy fallbacks
+    njit = None
+
+# Binary class names indexed by binary code
+BINARY_NAMES = np.array(["irrelevant", "relevant"], dtype=object)
+
+# Binary code of each label code, following utils.BIN_MAP (-1 = skip)
+_BINARY_CODES = {"irrelevant": 0, "relevant": 1}
+BINARY_TABLE = np.full(len(LABEL_CODES), -1, dtype=np.int8)
+for _label, _name in BIN_MAP.items():
+    BINARY_TABLE[LABEL_CODES[_label]] = _BINARY_CODES[_name]
+del _label, _name
+
+
+def _extract_pairs_numpy(true: np.ndarray, pred: np.ndarray):
+    mask = (true >= 0) & (pred >= 0)
+    return true[mask], pred[mask]
+
+
+def _to_binary_numpy(labels: np.ndarray) -> np.ndarray:
+    return np.where(labels >= 0, BINARY_TABLE[labels], -1).astype(np.int8)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def extract_pairs(true, pred):
+        """
+        Return aligned (true, pred) codes, skipping positions where either one is negative.
+        """
+        n = 0
+        for i in range(true.shape[0]):
+            if true[i] >= 0 and pred[i] >= 0:
+                n += 1
+
+        y_true = np.empty(n, dtype=np.int8)
+        y_pred = np.empty(n, dtype=np.int8)
+        j = 0
+        for i in range(true.shape[0]):
+            if true[i] >= 0 and pred[i] >= 0:
+                y_true[j] = true[i]
+                y_pred[j] = pred[i]
+                j += 1
+        return y_true, y_pred
+
+    @njit(cache=True)
+    def to_binary(labels):
+        """
+        Map label codes to binary relevance: 1 = relevant, 0 = irrelevant, -1 = skip.
+        """
+        out = np.empty(labels.shape[0], dtype=np.int8)
+        for i in range(labels.shape[0]):
+            code = labels[i]
+            out[i] = BINARY_TABLE[code] if code >= 0 else -1
+        return out
+
+else:
+    extract_pairs = _extract_pairs_numpy
+    to_binary = _to_binary_numpy
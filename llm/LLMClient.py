@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List, Optional
 
 class LLMClient(ABC):
     """Interface for LLM wrappers."""
@@ -6,4 +7,13 @@ class LLMClient(ABC):
     @abstractmethod
     def __call__(self, prompt: str, **kwargs) -> str:
         """Return the raw text output from the model."""
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def generate(self, prompts: List[str], batch_size: Optional[int] = None, **kwargs) -> List[str]:
+        """
+        Return the raw text outputs for several prompts, in order.
+
+        Backends able to run batched generation should override this and use
+        `batch_size` as a hint; the default falls back to one call per prompt.
+        """
+        return [self(prompt, **kwargs) for prompt in prompts]
\ No newline at end of file
@@ -1,19 +1,160 @@
-from llama_cpp import Llama
+import glob
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+from llama_cpp import Llama, LlamaRAMCache, llama_supports_gpu_offload
 from .LLMClient import LLMClient
 
+# Keyword arguments of `Llama.__call__` (per-call generation parameters) rather than of `Llama()`
+GENERATION_PARAMS = frozenset({
+    "suffix", "max_tokens", "temperature", "top_p", "min_p", "typical_p", "stop",
+    "frequency_penalty", "presence_penalty", "repeat_penalty", "top_k", "tfs_z",
+    "mirostat_mode", "mirostat_tau", "mirostat_eta", "grammar", "logit_bias",
+})
+
+
+def resolve_model_path(model_path: str, quant: Optional[str] = None) -> str:
+    """
+    Return the GGUF file to load for the requested quantization.
+
+    If `model_path` is a directory, the first `.gguf` file whose name contains
+    `quant` (e.g. "q4_k_m") is selected. If it is a file, it is used as-is and a
+    warning is logged when its name does not match `quant`.
+    """
+    if os.path.isdir(model_path):
+        candidates = sorted(glob.glob(os.path.join(model_path, "*.gguf")))
+        if quant:
+            candidates = [c for c in candidates if quant.lower() in os.path.basename(c).lower()]
+        if not candidates:
+            raise FileNotFoundError(f"No {quant or ''} GGUF model found in '{model_path}'")
+        return candidates[0]
+
+    if quant and quant.lower() not in os.path.basename(model_path).lower():
+        logging.warning("Model '%s' does not look like a %s quantization.", model_path, quant)
+    return model_path
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedPrompt:
+    """
+    A constant prompt prefix tokenized once, see `LlamaCppClient.bake_prefix`.
+    """
+    text: str
+    tokens: List[int]
+
+
 class LlamaCppClient(LLMClient):
-    """Simple llama-cpp wrapper with overridable call parameters."""
+    """
+    Simple llama-cpp wrapper with overridable call parameters.
+
+    Generation parameters given at construction (temperature, stop, max_tokens, ...)
+    become the defaults of every call; keyword arguments of a call override them.
+
+    Weights are memory-mapped by default (`use_mmap=True`, `use_mlock=False`),
+    so loading a quantized GGUF does not copy it into process memory.
 
-    def __init__(self, model_path: str, **kwargs) -> None:
+    A llama.cpp context cannot serve concurrent requests, so calls are
+    serialized with a lock; this makes the client safe to share between
+    analyzers running in threads (see CompositeAnalyzer).
+
+    With `n_gpu_layers=-1` every layer is offloaded to the GPU; a warning is logged
+    when llama-cpp-python was built without GPU support, since inference then
+    silently runs on the CPU. When fully offloaded, `n_threads` defaults to 1:
+    the CPU only coordinates, and extra threads just spin.
+
+    llama.cpp already skips the prefill of the tokens a prompt shares with the
+    previous one. With `prompt_cache_bytes`, the KV state of past prompts is also
+    kept in a `LlamaRAMCache`, so a prompt sharing a prefix with any recent one
+    (not only the last) resumes from it. A prefix shared by many prompts can also
+    be tokenized once with `bake_prefix` and completed with `call_with_prefix`.
+    """
+
+    def __init__(self, model_path: str, quant: Optional[str] = None, prompt_cache_bytes: int = 0,
+                 **kwargs) -> None:
+        """
+        Args:
+            model_path: GGUF file, or directory holding one file per quantization.
+            quant: Quantization to select (e.g. "q4_k_m"); see `resolve_model_path`.
+            prompt_cache_bytes: Capacity of the RAM prompt (KV state) cache; 0 disables it.
+            **kwargs: Generation defaults (see `GENERATION_PARAMS`); the rest is forwarded to `llama_cpp.Llama`.
+        """
+        self.generation_defaults = {k: kwargs.pop(k) for k in list(kwargs) if k in GENERATION_PARAMS}
+
+        model_path = resolve_model_path(model_path, quant)
+
+        n_gpu_layers = kwargs.get("n_gpu_layers", 0)
+        if n_gpu_layers != 0 and not llama_supports_gpu_offload():
+            logging.warning(
+                "llama-cpp-python was built without GPU support: n_gpu_layers=%s is ignored and inference runs "
+                "on the CPU. Reinstall it with CMAKE_ARGS=\"-DGGML_CUDA=on\" pip install --force-reinstall "
+                "--no-cache-dir llama-cpp-python", n_gpu_layers,
+            )
+        elif n_gpu_layers == -1 and kwargs.get("n_threads") is None:
+            kwargs["n_threads"] = 1
+
+        kwargs.setdefault("use_mmap", True)
+        kwargs.setdefault("use_mlock", False)
+        kwargs.setdefault("n_batch", 512)
         self._llama = Llama(model_path=model_path, **kwargs)
-        
+        if n_gpu_layers != 0 and llama_supports_gpu_offload():
+            # llama.cpp caps the request at the model's layer count; the effective count is in its own load log
+            logging.info("Requested offload of %s layers of '%s' to the GPU (n_threads=%s).",
+                         "all" if n_gpu_layers == -1 else n_gpu_layers, model_path, self._llama.n_threads)
+        if prompt_cache_bytes > 0:
+            self._llama.set_cache(LlamaRAMCache(capacity_bytes=prompt_cache_bytes))
+        self._llama_call = self._llama.__call__  # bound once, called on every generation
+        # Keys the output cache (see llm.cache): the model file and the sampling defaults both change outputs
+        settings = f"{os.path.realpath(model_path)}\0{sorted(self.generation_defaults.items())!r}"
+        self.model_id = f"{os.path.basename(model_path)}-{hashlib.sha256(settings.encode('utf-8')).hexdigest()[:16]}"
+        self._lock = threading.Lock()
 
-    # LlamaCppClient.py (only __call__ changed)
     def __call__(self, prompt: str, **gen_kwargs) -> str:
-        params = {**gen_kwargs}
-        out = self._llama(prompt, **params)
+        params = {**self.generation_defaults, **gen_kwargs} if gen_kwargs else self.generation_defaults
+        with self._lock:
+            out = self._llama_call(prompt, **params)
+        return self._output_text(out)
+
+    def bake_prefix(self, prefix: str) -> PreparedPrompt:
+        """
+        Tokenize a constant prompt prefix (system prompt, instructions, ...) once.
+        """
+        with self._lock:
+            tokens = self._llama.tokenize(prefix.encode("utf-8"), add_bos=True, special=True)
+        return PreparedPrompt(prefix, tokens)
+
+    def call_with_prefix(self, prepared: PreparedPrompt, suffix: str, **gen_kwargs) -> str:
+        """
+        Complete `prepared.text + suffix`, tokenizing only the suffix.
+
+        The token ids are given to llama.cpp directly, so consecutive calls sharing
+        `prepared` match on the prefix tokens and only the suffix is prefilled.
+        The suffix is tokenized on its own: start it at a word or line boundary so it
+        tokenizes as it would in the full prompt.
+        """
+        params = {**self.generation_defaults, **gen_kwargs} if gen_kwargs else self.generation_defaults
+        with self._lock:
+            tokens = prepared.tokens + self._llama.tokenize(suffix.encode("utf-8"), add_bos=False, special=True)
+            out = self._llama_call(tokens, **params)
+        return self._output_text(out)
+
+    def _output_text(self, out) -> str:
+        # Fast path: non-streaming completions are always {"choices": [{"text": ...}]}
+        try:
+            text = out["choices"][0]["text"]
+            if isinstance(text, str):
+                return text
+        except (KeyError, TypeError, IndexError):
+            pass
+        return self._normalize_output(out)
 
-        # Normalize to plain string; raise if we can't.
+    @staticmethod
+    def _normalize_output(out) -> str:
+        """
+        Normalize any other output shape to a plain string; raise if we can't.
+        """
         if isinstance(out, dict):
             if "choices" in out and out["choices"]:
                 text = out["choices"][0].get("text")
@@ -0,0 +1,170 @@
+"""
+Prompt -> output cache shared by every LLM-based analyzer.
+
+Analyzer prompts are deterministic functions of their template and of the
+(truncated) article content, so re-running over the same dataset regenerates
+identical prompts. Outputs are kept in an in-memory LRU keyed on the SHA-256
+of the prompt and generation parameters, optionally backed by a persistent
+`diskcache` directory so a second run becomes a hash lookup.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Union
+
+from .LLMClient import LLMClient
+
+MEMORY_CACHE_SIZE = 100_000
+
+_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+_lock = threading.Lock()
+_disk_cache = None
+
+
+def enable_disk_cache(directory: str = ".llm_cache") -> bool:
+    """
+    Persist cached outputs across runs in `directory`.
+
+    `diskcache` is an optional dependency; if it is not installed only the
+    in-memory cache is used.
+
+    Returns:
+        True if the disk cache is active.
+    """
+    global _disk_cache
+    try:
+        import diskcache
+    except ImportError:
+        logging.warning("diskcache is not installed; LLM outputs will only be cached in memory.")
+        return False
+
+    _disk_cache = diskcache.Cache(directory)
+    return True
+
+
+def clear_memory_cache() -> None:
+    """Drop every output held in the in-memory cache."""
+    with _lock:
+        _memory_cache.clear()
+
+
+def prompt_key(llm: LLMClient, prompt: str, max_tokens: int, stop: Sequence[str]) -> str:
+    """
+    Build the cache key of a generation request.
+
+    The key covers the model, the generation parameters and the prompt itself.
+    The model is identified by the client's `model_id`, which should also reflect
+    its sampling settings (`LlamaCppClient` derives it from the full model path
+    and its generation defaults), so outputs persisted on disk are never reused
+    for another model or configuration.
+    """
+    model_id = getattr(llm, "model_id", type(llm).__name__)
+    header = f"{model_id}\0{max_tokens}\0{chr(1).join(stop)}\0"
+    return hashlib.sha256((header + prompt).encode("utf-8")).hexdigest()
+
+
+def content_key(llm: LLMClient, template_digest: str, content_digest: str, max_tokens: int,
+                stop: Sequence[str]) -> str:
+    """
+    Build the cache key of a request whose prompt is a fixed template filled with some content.
+
+    Given the digests of the template and of the content, this replaces hashing the
+    whole prompt: the content digest is computed once per article (see
+    `Article.get_truncated_digest`) and shared by every analyzer using it.
+    """
+    model_id = getattr(llm, "model_id", type(llm).__name__)
+    header = f"{model_id}\0{max_tokens}\0{chr(1).join(stop)}\0{template_digest}\0{content_digest}"
+    return hashlib.sha256(header.encode("utf-8")).hexdigest()
+
+
+def template_digest(*parts: str) -> str:
+    """
+    Return the SHA-256 digest identifying a prompt template made of the given constant parts.
+    """
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _lookup(key: str) -> Optional[str]:
+    with _lock:
+        output = _memory_cache.get(key)
+        if output is not None:
+            _memory_cache.move_to_end(key)
+            return output
+
+    if _disk_cache is not None:
+        output = _disk_cache.get(key)
+        if output is not None:
+            _remember(key, output, persist=False)
+        return output
+    return None
+
+
+def _remember(key: str, output: str, persist: bool = True) -> None:
+    with _lock:
+        _memory_cache[key] = output
+        _memory_cache.move_to_end(key)
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+    if persist and _disk_cache is not None:
+        _disk_cache.set(key, output)
+
+
+def cached_llm_call(llm: LLMClient, prompt: str, max_tokens: int = 300, stop: Sequence[str] = ("</s>",),
+                    key: Optional[str] = None) -> str:
+    """
+    Call `llm` on `prompt`, reusing a previous output for the same request.
+
+    `key` may be given (see `content_key`) to avoid hashing the whole prompt.
+    Failed calls raise as usual and are not cached.
+    """
+    if key is None:
+        key = prompt_key(llm, prompt, max_tokens, stop)
+    output = _lookup(key)
+    if output is None:
+        output = llm(prompt, max_tokens=max_tokens, stop=list(stop))
+        _remember(key, output)
+    return output
+
+
+def cached_llm_generate(llm: LLMClient, prompts: List[str], max_tokens: int = 300,
+                        stop: Sequence[str] = ("</s>",), keys: Optional[List[str]] = None) -> List[Union[str, Exception]]:
+    """
+    Batched counterpart of `cached_llm_call`.
+
+    Only the prompts missing from the cache are sent to the model: in a single
+    `llm.generate` call if the client overrides it, otherwise one call at a time.
+    Failures are isolated per prompt: a prompt whose generation fails gets the
+    raised exception in place of its output, and every other output is still
+    returned and cached. If a batched call fails, its prompts are retried one by one.
+    """
+    if keys is None:
+        keys = [prompt_key(llm, prompt, max_tokens, stop) for prompt in prompts]
+    outputs = [_lookup(key) for key in keys]
+
+    missing = [i for i, output in enumerate(outputs) if output is None]
+    if missing and type(llm).generate is not LLMClient.generate:
+        try:
+            generated = llm.generate(
+                [prompts[i] for i in missing], max_tokens=max_tokens, stop=list(stop), batch_size=len(missing)
+            )
+        except Exception as e:
+            logging.warning("Batched generation of %d prompts failed, retrying one by one: %s", len(missing), e)
+        else:
+            for i, output in zip(missing, generated):
+                outputs[i] = output
+                _remember(keys[i], output)
+            missing = []
+
+    for i in missing:
+        try:
+            output = llm(prompts[i], max_tokens=max_tokens, stop=list(stop))
+        except Exception as e:
+            outputs[i] = e
+            continue
+        outputs[i] = output
+        _remember(keys[i], output)
+
+    return outputs
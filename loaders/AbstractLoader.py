@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Iterator, Dict, List
-import json
+from typing import Iterator, Dict, List, Optional
 import os
-from articles.Article import Article
-from utils import liberer_memoire
+import sys
+import orjson
+from articles.Article import Article, load_articles, is_json_list
+from utils import Label
 from tqdm import tqdm
 
 # TODO: TREATED_ITEMS should be a dict of Article objects, not a list, with id as key
@@ -17,8 +18,15 @@ class AbstractLoader(ABC):
     - Avoid reloading already treated items
     - Track treated articles and persist them to disk
     - Provide batch loading and iteration mechanisms
+
+    Treated articles are appended to the treated file as JSON Lines (one article
+    per line), so persisting an article costs one line whatever the file size.
+    Treated files in the former JSON list format are converted on load.
     """
 
+    # Number of marked articles between two progress messages
+    REPORT_EVERY = 25
+
     def __init__(self, treated_file: str = "treated_items.json", keep_content: bool = False):
         """
         Initialize the loader.
@@ -30,22 +38,30 @@ class AbstractLoader(ABC):
         self.treated_file = treated_file
         self.keep_content = keep_content
         self.treated_items: Dict[str, Article] = {}
+        self._by_hash: Dict[str, Article] = {}  # content SHA-256 -> first treated article with that content
+        self._treated_fh = None  # Append handle on the treated file, opened on first write
 
         if os.path.exists(self.treated_file):
-            with open(self.treated_file, "r", encoding="utf-8") as f:
-                try:
-                    data = json.load(f)
-                    if not isinstance(data, list):
-                        print(f"[ERROR] Expected list in JSON, got {type(data)}. Starting fresh.")
-                        data = []
-                except json.JSONDecodeError:
-                    print(f"[ERROR] Failed to decode JSON. Starting with an empty list.")
-                    data = []
-
-            for article_data in data:
-                article = Article.from_dict(article_data, keep_content=keep_content)
-                self.treated_items[article.get_id()] = article  # Use dict to ensure uniqueness
+            legacy = is_json_list(self.treated_file)
+            try:
+                articles = list(load_articles(self.treated_file, keep_content=keep_content))
+            except orjson.JSONDecodeError:
+                # Keep the unreadable file aside rather than converting (i.e. emptying) it
+                backup = self.treated_file + ".bak"
+                os.replace(self.treated_file, backup)
+                print(f"[ERROR] Failed to decode JSON. Moved '{self.treated_file}' to '{backup}' and starting with an empty list.")
+                articles = []
+                legacy = False
+
+            for article in articles:
+                # Use dict to ensure uniqueness; ids are interned like the loader-generated ones
+                self.treated_items[sys.intern(article.get_id())] = article
+                self._index_content_hash(article)
             print(f"[INFO] Loaded {len(self.treated_items)} treated items from '{self.treated_file}'.")
+
+            if legacy:
+                self._rewrite_treated_file()
+                print(f"[INFO] Converted '{self.treated_file}' to JSON Lines.")
         else:
             print(f"[WARNING] Treated file '{self.treated_file}' not found. Starting with an empty list.")
 
@@ -94,15 +110,67 @@ class AbstractLoader(ABC):
             return
 
         self.treated_items[article_id] = treated_item
-        treated_list = [
-            article.to_dict(include_content=self.keep_content)
-            for article in self.treated_items.values()
-        ]
-        with open(self.treated_file, "w", encoding="utf-8") as f:
-            json.dump(treated_list, f, ensure_ascii=False, indent=2)
+        self._index_content_hash(treated_item)
+
+        if self._treated_fh is None:
+            self._open_treated_file()
+        self._treated_fh.write(self._dump_line(treated_item))
+        # Flush so an interrupted run can resume from every article marked so far
+        self._treated_fh.flush()
+
+        if len(self.treated_items) % self.REPORT_EVERY == 0:
+            tqdm.write(f"[INFO] Total marked {len(self.treated_items)} items as treated.")
+
+    def _open_treated_file(self):
+        """
+        Open the treated file for appending, terminating a partially written last line if any.
+        """
+        self._treated_fh = open(self.treated_file, "ab", buffering=1 << 16)
+        if self._treated_fh.tell() > 0:
+            with open(self.treated_file, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._treated_fh.write(b"\n")
+
+    def _dump_line(self, article: Article) -> bytes:
+        """
+        Serialize an article as one JSON line (UTF-8 encoded by orjson).
+        """
+        return orjson.dumps(article.to_dict(include_content=self.keep_content), option=orjson.OPT_APPEND_NEWLINE)
 
-        tqdm.write(f"[INFO] Total marked {len(self.treated_items)} items as treated.")
-        liberer_memoire()
+    def _rewrite_treated_file(self):
+        """
+        Rewrite the whole treated file as JSON Lines from the in-memory treated items.
+        """
+        self.close()
+        tmp_path = self.treated_file + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for article in self.treated_items.values():
+                f.write(self._dump_line(article))
+        os.replace(tmp_path, self.treated_file)
+
+    def close(self):
+        """
+        Close the treated file handle, if open. Marking another article reopens it.
+        """
+        if self._treated_fh is not None:
+            self._treated_fh.close()
+            self._treated_fh = None
+
+    def _index_content_hash(self, article: Article):
+        """
+        Remember the article as the reference result for its content, unless its analysis failed.
+        """
+        if article.content_sha256 and article.predicted_label not in (None, Label.ERROR):
+            self._by_hash.setdefault(article.content_sha256, article)
+
+    def find_by_content_hash(self, content_sha256: Optional[str]) -> Optional[Article]:
+        """
+        Return the treated article whose content has this SHA-256, if any.
+        """
+        if not content_sha256:
+            return None
+        return self._by_hash.get(content_sha256)
 
     def get_treated_items(self) -> Dict[str, Article]:
         """
@@ -127,6 +195,7 @@ class AbstractLoader(ABC):
         """
         Delete the treated items file and clear internal memory.
         """
+        self.close()
         if os.path.exists(self.treated_file):
             os.remove(self.treated_file)
             print(f"[INFO] Deleted treated items file: {self.treated_file}")
@@ -134,4 +203,5 @@ class AbstractLoader(ABC):
             print(f"[WARNING] Treated items file '{self.treated_file}' does not exist.")
 
         self.treated_items.clear()
+        self._by_hash.clear()
         print("[INFO] Cleared in-memory treated items list.")
@@ -1,9 +1,64 @@
 from .AbstractLoader import AbstractLoader
 from articles.Article import Article
+from collections import deque
 import os
+import sys
+import threading
 from typing import List
 import pandas as pd
-from utils import Label
+from utils import LABEL_BY_VALUE
+
+# posix_fadvise is only available on POSIX platforms (not on Windows or macOS)
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+
+def _read_text(path: str) -> str:
+    """
+    Read a whole UTF-8 text file with raw os.read calls, bypassing the buffered text I/O layers.
+
+    Line endings are normalized to '\\n', as text-mode `open` does.
+    """
+    # O_BINARY (Windows only) keeps the CRT from translating the bytes read
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if _HAS_FADVISE:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # The file may be larger than reported, or read short: finish until EOF
+        while True:
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _advise_willneed(paths: List[str], window: threading.Semaphore) -> None:
+    """
+    Ask the kernel to start reading `paths` into the page cache, in order.
+
+    One slot of `window` is taken per file, so this stays a bounded number of
+    files ahead of the reader releasing it.
+    """
+    for path in paths:
+        window.acquire()
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
 
 
 class FileLoader(AbstractLoader):
@@ -15,34 +70,61 @@ class FileLoader(AbstractLoader):
     - An optional `index.csv` file mapping filenames to true labels
 
     Skips already treated articles using the logic from AbstractLoader.
+    The directory is scanned once, at construction: files added afterwards are not picked up.
+
+    Where `os.posix_fadvise` exists (Linux), a background thread hints the kernel to
+    read the next `readahead` files ahead of time, so reads hit the page cache.
     """
 
-    def __init__(self, data_dir: str = "../data", treated_file: str = "treated_items.csv"):
+    def __init__(self, data_dir: str = "../data", treated_file: str = "treated_items.csv",
+                 readahead: int = 32):
         """
         Initialize the file loader.
 
         Args:
             data_dir (str): Path to the directory containing text files and index.csv.
             treated_file (str): Path to JSON file storing already treated articles.
+            readahead (int): Number of files hinted to the kernel ahead of reading (0 disables it).
         """
         super().__init__(treated_file)
         self.data_dir = data_dir
 
         index_path = os.path.join(data_dir, "index.csv")
         if os.path.exists(index_path):
-            index_df = pd.read_csv(index_path)
-            # Build a mapping from file basename (without .txt) to label string
-            self.index = {
-                str(row["filename"])[:-4]: row["label"]
-                for _, row in index_df.iterrows()
-                if pd.notna(row["label"])
-            }
+            # Only the two needed columns are parsed, as strings (no dtype inference)
+            index_df = pd.read_csv(
+                index_path, usecols=["filename", "label"], dtype={"filename": "string", "label": "string"}
+            ).dropna(subset=["filename", "label"])
+            # Build a mapping from file basename (without .txt) to lowercased label string,
+            # with column operations instead of a Python loop over rows
+            self.index = dict(zip(
+                map(sys.intern, index_df["filename"].str[:-4].tolist()),
+                index_df["label"].str.lower().tolist(),
+            ))
         else:
             print(f"[WARNING] index.csv not found in {data_dir}")
             self.index = {}
 
         print(f"[INFO] Loaded index with {len(self.index)} items from '{index_path}'.")
 
+        # Untreated .txt files, scanned once and consumed by _load_one.
+        # The treated dict supports O(1) membership tests itself, no set copy needed.
+        with os.scandir(self.data_dir) as entries:
+            self._pending = deque(
+                entry for entry in entries
+                if entry.name.endswith('.txt') and entry.name[:-4] not in self.treated_items
+            )
+
+        self._readahead_window = None
+        if _HAS_FADVISE and readahead > 0 and self._pending:
+            self._readahead_window = threading.Semaphore(readahead)
+            threading.Thread(
+                target=_advise_willneed,
+                args=([entry.path for entry in self._pending], self._readahead_window),
+                name="readahead",
+                daemon=True,
+            ).start()
+
     def _get_untreated_filenames(self) -> List[str]:
         """
         Get the list of .txt files in the data directory that have not been treated yet.
@@ -50,31 +132,34 @@ class FileLoader(AbstractLoader):
         Returns:
             List of untreated filenames (including .txt extension).
         """
-        treated_ids = {id for id in self.treated_items.keys()}
-        all_txt_files = [f for f in os.listdir(self.data_dir) if f.endswith('.txt')]
-        return [f for f in all_txt_files if f[:-4] not in treated_ids]
+        return [entry.name for entry in self._pending if entry.name[:-4] not in self.treated_items]
 
     def _load_one(self) -> Article:
         """
         Load one untreated article from disk.
 
+        Safe to call from several threads: each entry is claimed by a single `popleft`,
+        which is atomic, rather than by a check followed by a pop.
+
         Returns:
             An Article object, or None if no untreated files remain.
         """
-        untreated_files = self._get_untreated_filenames()
-        if not untreated_files:
+        try:
+            entry = self._pending.popleft()
+        except IndexError:
             return None
 
-        file_name = untreated_files[0]
-        article_id = file_name[:-4]
-        file_path = os.path.join(self.data_dir, file_name)
+        if self._readahead_window is not None:
+            self._readahead_window.release()
+        file_name = entry.name
+        article_id = sys.intern(file_name[:-4])
+        file_path = entry.path
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = _read_text(file_path)
 
         # Use the label from the index if available
-        label_str = self.index.get(article_id, "").lower()
-        true_label = Label(label_str) if label_str in Label._value2member_map_ else None
+        label_str = self.index.get(article_id, "")
+        true_label = LABEL_BY_VALUE.get(label_str)
 
         return Article(
             id=article_id,
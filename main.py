@@ -1,12 +1,13 @@
 import argparse
 import os
-import json
 import logging
+from typing import Optional
 
 from llm.LLMClient import LLMClient
 from llm.LlamaCppClient import LlamaCppClient
+from llm.cache import enable_disk_cache
 
-from config import DATA_DIR, TREATED_FILE, MODEL_PATH, QUESTION_TREE_PATH, LOG_LEVEL
+from config import DATA_DIR, TREATED_FILE, MODEL_PATH, MODEL_QUANT, QUESTION_TREE_PATH, QUESTION_TREE_CACHE_PATH, LOG_LEVEL, LLM_CACHE_DIR, MIN_CHARS
 
 from loaders.FileLoader import FileLoader
 from processors.ArticleProcessor import ArticleProcessor
@@ -17,13 +18,16 @@ from analyzers.NaiveAnalyzer import NaiveAnalyzer
 from analyzers.CompositeAnalyzer import CompositeAnalyzer
 from analyzers.RelevanceAnalyzer import RelevanceAnalyzer
 from analyzers.QuestionnaryAnalyzer import QuestionnaryAnalyzer
+from analyzers.DistilledRelevanceAnalyzer import DistilledRelevanceAnalyzer
+from analyzers.AutoSwitchAnalyzer import AutoSwitchAnalyzer
 
 # Descriptions of each analyzer for CLI documentation
 ANALYZER_DOCS = {
     "questionnary": "Decision tree-based analyzer using yes/no LLM answers at each node.",
     "expert": "Simulates a neutral media analyst specialized in Indian geopolitics.",
     "naive": "Simulates a thoughtful, open-minded person with no strong opinion about India.",
-    "relevance": "Focuses solely on relevance estimation, ignoring sentiment or position.",
+    "relevance": "Focuses solely on relevance estimation, ignoring sentiment or position. With --distilled-model-path, switches to the distilled classifier after --autoswitch-after articles.",
+    "distilled": "Relevance classifier (e.g. DistilBERT) distilled from the relevance analyzer; runs batched on GPU.",
     "composite": "Combines multiple analyzers (e.g., expert + naive) to aggregate decisions."
 }
 
@@ -41,9 +45,23 @@ def main():
     parser.add_argument("--limit", type=int, default=None, help="Maximum number of articles to process")
     parser.add_argument("--evaluate", action="store_true", help="Evaluate results using labels from index.csv")
     parser.add_argument("--fresh-start", action="store_true", help="Delete treated file and start fresh")
-    parser.add_argument("--model-path", type=str, default=MODEL_PATH, help="Path to LLaMA model in GGUF format")
+    parser.add_argument("--model-path", type=str, default=MODEL_PATH, help="Path to LLaMA model in GGUF format (or a directory of GGUF files)")
+    parser.add_argument("--quant", type=str, default=MODEL_QUANT, help="GGUF quantization to use, e.g. q4_k_m, q5_k_m or f16")
+    parser.add_argument("--batch-size", type=int, default=1, help="Number of articles analyzed together (through analyze_batch); only useful with a backend whose generate() batches prompts")
+    parser.add_argument("--min-chars", type=int, default=MIN_CHARS, help="Articles shorter than this are labeled too_short without being analyzed")
+    parser.add_argument("--n-gpu-layers", type=int, default=-1, help="Number of model layers offloaded to the GPU (-1 for all, 0 for CPU only)")
+    parser.add_argument("--n-threads", type=int, default=None, help="CPU threads used by llama.cpp (default: 1 when fully offloaded, else half the cores)")
+    parser.add_argument("--n-batch", type=int, default=512, help="llama.cpp logical batch size for prompt processing")
+    parser.add_argument("--n-ubatch", type=int, default=512, help="llama.cpp physical (micro) batch size")
+    parser.add_argument("--flash-attn", action="store_true", help="Enable flash attention in llama.cpp (reduces KV memory traffic)")
+    parser.add_argument("--prompt-cache-mb", type=int, default=0, help="RAM (MB) for llama.cpp's KV prompt cache, reused across prompts sharing a prefix (0 to disable)")
     parser.add_argument("--tree-path", type=str, default=QUESTION_TREE_PATH, help="Path to decision tree JSON file")
+    parser.add_argument("--distilled-model-path", type=str, default=None, help="Path to the fine-tuned relevance classifier used by the distilled analyzer (or switched to by the relevance analyzer)")
+    parser.add_argument("--autoswitch-after", type=int, default=5000, help="With --analyzer relevance and --distilled-model-path, switch to the distilled classifier once this many articles are treated")
+    parser.add_argument("--tree-cache-path", type=str, default=QUESTION_TREE_CACHE_PATH, help="Pickled decision tree cache, rebuilt when the tree JSON changes (empty to disable)")
+    parser.add_argument("--compile-tree", action="store_true", help="Ask all decision tree questions in a single LLM call per article")
     parser.add_argument("--analyzer", type=str, choices=list(ANALYZER_DOCS.keys()), default="questionnary", help="Which analyzer to use for classification")
+    parser.add_argument("--llm-cache-dir", type=str, default=LLM_CACHE_DIR, help="Directory used to persist LLM outputs across runs (requires diskcache)")
     parser.add_argument("--analyzer-help", type=str, nargs="?", const="all", help="Show explanation of available analyzers (or a specific one) and exit")
     args = parser.parse_args()
 
@@ -62,20 +80,32 @@ def main():
                 print("Use --analyzer-help all to list all available analyzers.")
         return
 
-    llm: LLMClient = LlamaCppClient(
-        model_path=args.model_path,
-        n_ctx=4096,
-        n_threads=12,
-        n_gpu_layers=-1,
-        verbose=False,
-        logits_all=False,
-        embedding=False,
-        temperature=0.1,
-        top_p=0.95,
-        repeat_penalty=1.1,
-        stop=["</s>"],
-        max_tokens=500,
-    )
+    # The distilled classifier does not use the LLM: do not load the GGUF model next to it on the GPU
+    llm: Optional[LLMClient] = None
+    if args.analyzer != "distilled":
+        llm = LlamaCppClient(
+            model_path=args.model_path,
+            quant=args.quant,
+            prompt_cache_bytes=args.prompt_cache_mb << 20,
+            n_ctx=4096,
+            n_threads=args.n_threads,
+            n_gpu_layers=args.n_gpu_layers,
+            n_batch=args.n_batch,
+            n_ubatch=args.n_ubatch,
+            flash_attn=args.flash_attn,
+            verbose=False,
+            logits_all=False,
+            embedding=False,
+            temperature=0.1,
+            top_p=0.95,
+            repeat_penalty=1.1,
+            stop=["</s>"],
+            max_tokens=500,
+        )
+
+    # Optionally persist LLM outputs across runs
+    if args.llm_cache_dir:
+        enable_disk_cache(args.llm_cache_dir)
 
     # Optionally start from scratch by deleting treated file
     if args.fresh_start:
@@ -90,27 +120,47 @@ def main():
 
     # Instantiate the selected analyzer
     if args.analyzer == "questionnary":
-        with open(args.tree_path, "r", encoding="utf-8") as f:
-            tree_data = json.load(f)
-        analyzer = QuestionnaryAnalyzer.build_tree_from_json(tree_data, llm)
+        analyzer = QuestionnaryAnalyzer.load_tree(args.tree_path, llm, cache_path=args.tree_cache_path or None)
+        if args.compile_tree:
+            try:
+                analyzer.compile()
+            except ValueError as e:
+                parser.error(f"--compile-tree: {e}")
     elif args.analyzer == "expert":
         analyzer = ExpertAnalyzer(llm)
     elif args.analyzer == "naive":
         analyzer = NaiveAnalyzer(llm)
     elif args.analyzer == "relevance":
         analyzer = RelevanceAnalyzer(llm)
+        if args.distilled_model_path:
+            # Articles treated by previous runs count towards the switch
+            analyzer = AutoSwitchAnalyzer(
+                analyzer,
+                DistilledRelevanceAnalyzer(args.distilled_model_path),
+                autoswitch_after=args.autoswitch_after,
+                analyzed_count=len(loader.get_treated_items()),
+            )
+    elif args.analyzer == "distilled":
+        if not args.distilled_model_path:
+            parser.error("--analyzer distilled requires --distilled-model-path")
+        analyzer = DistilledRelevanceAnalyzer(args.distilled_model_path)
     elif args.analyzer == "composite":
+        # The distilled classifier only predicts relevance: it cannot stand in for the sentiment analyzers
+        if args.distilled_model_path:
+            parser.error("--distilled-model-path cannot be used with --analyzer composite (expert + naive sentiment)")
         analyzer = CompositeAnalyzer([ExpertAnalyzer(llm), NaiveAnalyzer(llm)])
     else:
         raise ValueError(f"Unsupported analyzer type: {args.analyzer}")
 
     # Process articles
-    processor = ArticleProcessor(loader, analyzer)
+    processor = ArticleProcessor(loader, analyzer, batch_size=args.batch_size, min_chars=args.min_chars)
 
     try:
         processor.run(limit=args.limit)
     except KeyboardInterrupt:
         logging.warning("Keyboard interrupt received. Proceeding to evaluation...")
+    finally:
+        loader.close()
 
     # Evaluate the output if requested or if results exist
     if args.evaluate or processor.results:
@@ -1,9 +1,53 @@
 from loaders.AbstractLoader import AbstractLoader
 from analyzers.AbstractAnalyzer import AbstractAnalyzer
 from articles.Article import Article
-from typing import Optional
+from articles.ArticleResult import ArticleResult
+from utils import Label, liberer_memoire
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
 from tqdm import tqdm
 
+logger = logging.getLogger(__name__)
+
+
+def _prefetch_iter(loader: AbstractLoader, depth: int = 4, max_workers: int = 2,
+                   limit: Optional[int] = None) -> Iterator[Article]:
+    """
+    Yield the loader's articles while the next ones are read in background threads.
+
+    Up to `depth` calls to `loader._load_one` are kept in flight, so reading files and
+    looking up labels overlaps with the analysis of the current article (llama.cpp
+    releases the GIL during inference). The loader's `_load_one` must be thread-safe.
+    At most `limit` articles are requested, so none is loaded and then dropped.
+    """
+    remaining = limit if limit else float("inf")
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+    futures = deque()
+
+    def submit():
+        nonlocal remaining
+        if remaining > 0:
+            remaining -= 1
+            futures.append(pool.submit(loader._load_one))
+
+    for _ in range(depth):
+        submit()
+    exhausted = False
+    try:
+        while futures:
+            article = futures.popleft().result()
+            if article is None:
+                # Calls still in flight may have started before the source ran dry: drain them
+                exhausted = True
+                continue
+            if not exhausted:
+                submit()
+            yield article
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
 
 class ArticleProcessor:
     """
@@ -11,21 +55,35 @@ class ArticleProcessor:
 
     It handles:
     - Iterating over articles using a loader
-    - Applying an analyzer to each article
-    - Storing results
+    - Labeling articles shorter than `min_chars` as TOO_SHORT without analyzing them
+    - Applying an analyzer to each article (or to batches of articles)
+    - Reusing the result of an already treated article with the same content
+    - Storing compact results (`ArticleResult`), dropping the content of the articles
+      when the loader does not keep it
     - Marking articles as treated
+    - Collecting garbage every `MEMORY_CLEANUP_EVERY` articles
     """
 
-    def __init__(self, loader: AbstractLoader, analyzer: AbstractAnalyzer):
+    # Number of processed articles between two memory cleanups
+    MEMORY_CLEANUP_EVERY = 50
+
+    def __init__(self, loader: AbstractLoader, analyzer: AbstractAnalyzer, prefetch: int = 4,
+                 batch_size: int = 1, min_chars: int = 0):
         """
         Initialize the processing pipeline.
 
         Args:
             loader (AbstractLoader): The source of articles to process.
             analyzer (AbstractAnalyzer): The analyzer to apply to each article.
+            prefetch (int): Number of articles loaded ahead in background threads (0 to load serially).
+            batch_size (int): Number of articles handed together to `analyzer.analyze_batch`.
+            min_chars (int): Articles with fewer characters are labeled TOO_SHORT without being analyzed.
         """
         self.loader = loader
         self.analyzer = analyzer
+        self.prefetch = prefetch
+        self.batch_size = max(batch_size, 1)
+        self.min_chars = min_chars
         self.results = []
         self.total_processed = 0
 
@@ -38,23 +96,87 @@ class ArticleProcessor:
         """
         total_processed = 0
 
-        iterator = self.loader.iter_articles()
+        if self.prefetch > 0:
+            # Keep at least a full batch in flight
+            iterator = _prefetch_iter(self.loader, depth=max(self.prefetch, self.batch_size), limit=limit)
+        else:
+            iterator = self.loader.iter_articles()
         if limit:
             iterator = tqdm(iterator, total=limit, desc="Processing articles")
         else:
             iterator = tqdm(iterator, desc="Processing articles")
 
+        batch = []
         for article in iterator:
-            tqdm.write(f"[INFO] Processing article: {article.id} - {article.meta.get('filename', 'Unknown')}")
-            analyzed = self.analyzer.analyze(article)
+            logger.debug("Processing article: %s - %s", article.id, article.meta.get("filename", "Unknown"))
+            batch.append(article)
 
-            self.results.append(analyzed)
-            self.total_processed += 1
-            total_processed += 1
+            if len(batch) >= self.batch_size:
+                total_processed += self._process_batch(batch)
+                batch = []
 
-            self.loader.mark_as_treated(analyzed)
-
-            if limit and total_processed >= limit:
+            if limit and total_processed + len(batch) >= limit:
                 break
 
+        if batch:
+            total_processed += self._process_batch(batch)
+
         print(f"[INFO] Processed {total_processed} articles.")
+
+    def _process_batch(self, batch: List[Article]) -> int:
+        """
+        Analyze a batch of articles, store the results and mark them as treated.
+
+        Returns:
+            The number of articles processed.
+        """
+        # Duplicates of already treated content reuse its result instead of being analyzed again
+        to_analyze = []
+        skipped = set()  # indices of the articles that are not analyzed
+        for i, article in enumerate(batch):
+            if len(article.content) < self.min_chars:
+                # Too little signal to be worth an LLM call
+                article.set_label(Label.TOO_SHORT)
+                article.add_metadata("error", f"Content too short: {len(article.content)} characters")
+                article.mark_as_treated()
+                skipped.add(i)
+                continue
+
+            original = self.loader.find_by_content_hash(article.content_sha256)
+            if original is None:
+                to_analyze.append(article)
+            else:
+                self._copy_result(original, article)
+                skipped.add(i)
+
+        if len(to_analyze) == 1:
+            analyzed = iter([self.analyzer.analyze(to_analyze[0])])
+        else:
+            analyzed = iter(self.analyzer.analyze_batch(to_analyze) if to_analyze else [])
+        analyzed_batch = [article if i in skipped else next(analyzed) for i, article in enumerate(batch)]
+
+        before = self.total_processed
+        for analyzed in analyzed_batch:
+            self.results.append(ArticleResult.from_article(analyzed))
+            self.total_processed += 1
+            self.loader.mark_as_treated(analyzed)
+            if not self.loader.keep_content:
+                # Already persisted; the treated article only serves duplicate lookups from now on
+                analyzed.drop_content()
+
+        # Clean up once each time the count crosses a multiple of MEMORY_CLEANUP_EVERY
+        if self.total_processed // self.MEMORY_CLEANUP_EVERY > before // self.MEMORY_CLEANUP_EVERY:
+            liberer_memoire()
+
+        return len(analyzed_batch)
+
+    @staticmethod
+    def _copy_result(original: Article, article: Article) -> None:
+        """
+        Give `article` the label and analysis of `original`, which has the same content.
+        """
+        article.predicted_label = original.predicted_label
+        article.analysis.update(original.analysis)
+        article.meta.update(original.meta)
+        article.add_metadata("duplicate_of", original.id)
+        article.mark_as_treated()
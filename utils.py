@@ -1,10 +1,11 @@
 import gc
+import sys
 from enum import Enum
 
 
 def liberer_memoire():
     """
-    Force garbage collection and free GPU memory if available.
+    Force garbage collection, and free PyTorch's cached GPU memory if a PyTorch model is loaded.
 
     This function is safe to call even if PyTorch is not installed.
     It is typically called after processing large data batches to
@@ -12,16 +13,17 @@ def liberer_memoire():
 
     Steps:
         1. Trigger Python's garbage collector.
-        2. If PyTorch with CUDA is available, empty the GPU cache.
+        2. If PyTorch was imported (e.g. by the distilled classifier) and CUDA is in use, empty the GPU cache.
+
+    llama.cpp manages its own VRAM pool, outside PyTorch's allocator, and never
+    imports PyTorch, so LLM-only runs skip the (device-synchronizing) cache flush.
     """
     gc.collect()
-    try:
-        import torch
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-    except ImportError:
-        # PyTorch is not installed, ignore
-        pass
+
+    # Only look at PyTorch if something already imported it
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
 
 
 class Label(Enum):
@@ -56,3 +58,29 @@ class Label(Enum):
     def __str__(self):
         """Return the string value of the label."""
         return self.value
+
+    @property
+    def bit(self) -> int:
+        """Return the single-bit mask of the label, used for bitset membership tests."""
+        return LABEL_BITS[self]
+
+
+# Small-int code of each label (definition order), used by array-based evaluation
+LABEL_CODES = {label: code for code, label in enumerate(Label)}
+
+# Single-bit mask of each label: a set of labels can be held in one int
+LABEL_BITS = {label: 1 << code for label, code in LABEL_CODES.items()}
+
+# Label of each string value, for parsing external label strings with a single lookup
+LABEL_BY_VALUE = {label.value: label for label in Label}
+
+# String value of each label, looked up instead of re-stringifying the enum on every item
+LABEL_TO_STR = {label: str(label.value) for label in Label}
+
+# Binary relevance class of each label; labels missing here are skipped (use BIN_MAP.get(label, "skip"))
+BIN_MAP = {
+    Label.POSITIVE: "relevant",
+    Label.NEGATIVE: "relevant",
+    Label.NEUTRAL: "relevant",
+    Label.IRRELEVANT: "irrelevant",
+}